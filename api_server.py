@@ -0,0 +1,401 @@
+# api_server.py
+#
+# Asyncio HTTP service for calling the analyzer without the Streamlit UI, e.g.
+#   python api_server.py --port 8000
+#   curl --data-binary @resume.pdf "localhost:8000/analyze?company=TCS&designation=Software%20Developer&name=Asha"
+#
+# Endpoints
+#   GET  /health                  liveness + in-flight count
+#   GET  /metrics                 Prometheus text format (see metrics.py)
+#   POST /analyze?company=&designation=&experience=&name=&save=1   body: raw PDF bytes
+#                                 resubmissions of an already stored resume are not
+#                                 stored again; the response's "saved" says which row
+#   POST /score-all?top_n=10      body: raw PDF bytes; ranks every company/role
+#   GET  /history?company=&designation=&experience=&min_score=&max_score=&max_rows=&collapse=1
+#                                 streamed as NDJSON, one keyset page at a time
+#   POST /jobs?company=&designation=&experience=&name=&rank_all=0&priority=bulk&user=
+#                                 body: raw PDF bytes; queues the analysis (jobs.py) and
+#                                 answers 202 with {"job_id"} right away
+#   GET  /jobs/<job_id>           status, and the result once it is done
+#
+# Add profile=1 to /analyze or /score-all to cProfile that one request; the
+# dump's path comes back in the X-Profile header.
+#
+# PDF parsing and scoring run in a process pool, database calls in a thread
+# pool, so the event loop only moves bytes. A job that runs past
+# CPU_TIMEOUT_SECONDS is answered with 504 but keeps its in-flight slot until
+# the pool finishes it. At most `max_in_flight` requests are processed at
+# once; beyond that the server answers 429 immediately instead of queueing
+# unbounded work.
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import backend
+import jobs
+import metrics
+import pdf_extract
+
+MAX_IN_FLIGHT = 16
+MAX_HEADER_BYTES = 16 * 1024
+READ_TIMEOUT_SECONDS = 30
+# Upper bound on one /analyze or /score-all job, on top of pdf_extract's per-page limit
+CPU_TIMEOUT_SECONDS = 60
+HISTORY_PAGE_SIZE = 500
+MAX_TOP_N = 200
+MAX_HISTORY_ROWS = 100000
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# ----------------- Process pool jobs -----------------
+def _read_pdf(data):
+    try:
+        return backend.extract_text_from_pdf(data)
+    except (pdf_extract.PDFLimitError, pdf_extract.PDFWorkerError):
+        raise
+    except Exception as e:
+        # pdfminer raises a zoo of types for corrupt uploads; report them as bad input
+        raise pdf_extract.PDFLimitError(f"Unreadable PDF ({type(e).__name__}: {e})")
+
+
+# Jobs return (value, profile path, metrics snapshot); the parent merges the
+# snapshot so /metrics covers work done in the pool processes too.
+def _analyze_pdf(data, company, designation, experience, profile=False):
+    try:
+        with metrics.profiled("analyze", enabled=profile) as prof:
+            text = _read_pdf(data)
+            result = backend.analyze_resume(text, company, designation, experience)
+            fp = backend.fingerprint_text(text)
+        return (result, fp), prof["path"], metrics.take_snapshot()
+    except Exception as e:
+        e.metrics_snapshot = metrics.take_snapshot()
+        raise
+
+
+def _score_pdf(data, top_n, profile=False):
+    try:
+        with metrics.profiled("score-all", enabled=profile) as prof:
+            ranking = backend.score_all_roles(_read_pdf(data), top_n)
+        return ranking, prof["path"], metrics.take_snapshot()
+    except Exception as e:
+        e.metrics_snapshot = metrics.take_snapshot()
+        raise
+
+
+# ----------------- Request helpers -----------------
+def _param(query, key, default=None):
+    values = query.get(key)
+    return values[0] if values else default
+
+
+def _int_param(query, key, default=None):
+    value = _param(query, key)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{key} must be an integer")
+
+
+# Positive integer parameter, capped at `maximum`
+def _count_param(query, key, default, maximum):
+    value = _int_param(query, key, default)
+    if value < 1:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{key} must be at least 1")
+    return min(value, maximum)
+
+
+def _role_params(query):
+    company = _param(query, "company")
+    designation = _param(query, "designation")
+    experience = _param(query, "experience", "Fresher")
+    if designation not in backend.COMPANY_REQUIREMENTS.get(company, {}):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "unknown company/designation")
+    if experience not in ("Fresher", "Experienced"):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "experience must be Fresher or Experienced")
+    return company, designation, experience
+
+
+def _profile_header(path):
+    return {"X-Profile": path} if path else None
+
+
+# ----------------- Server -----------------
+class AnalyzerServer:
+    def __init__(self, host="127.0.0.1", port=8000, max_in_flight=MAX_IN_FLIGHT, workers=None,
+                 job_workers=jobs.DEFAULT_WORKERS):
+        self.host = host
+        self.job_workers = job_workers
+        self.port = port
+        self.max_in_flight = max_in_flight
+        self.workers = workers or os.cpu_count() or 1
+        self.in_flight = 0
+        self._server = None
+        self._cpu_pool = None
+        self._io_pool = None
+
+    async def start(self):
+        self._cpu_pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=pdf_extract.disable_page_pool,
+        )
+        self._io_pool = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="api-db")
+        if self.job_workers:
+            await self._run_io(backend.start_job_workers, self.job_workers)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_HEADER_BYTES)
+        # port=0 picks a free port; report the real one
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown(cancel_futures=True)
+        if self._io_pool is not None:
+            self._io_pool.shutdown(cancel_futures=True)
+
+    async def _run_cpu(self, fn, *args):
+        future = self._cpu_pool.submit(fn, *args)
+        try:
+            value, profile_path, snapshot = await asyncio.wait_for(asyncio.wrap_future(future), CPU_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            # A job that already started keeps running in the pool; it holds an
+            # in-flight slot until it ends, so 429s still track real CPU work
+            if not future.done():
+                self.in_flight += 1
+                loop = asyncio.get_running_loop()
+                future.add_done_callback(lambda _: self._release_later(loop))
+            raise HTTPError(HTTPStatus.GATEWAY_TIMEOUT, f"analysis took longer than {CPU_TIMEOUT_SECONDS}s")
+        except Exception as e:
+            metrics.merge_snapshot(getattr(e, "metrics_snapshot", {}))
+            raise
+        metrics.merge_snapshot(snapshot)
+        return value, profile_path
+
+    def _release_later(self, loop):
+        try:
+            loop.call_soon_threadsafe(self._release_slot)
+        except RuntimeError:
+            pass  # loop already closed
+
+    def _release_slot(self):
+        self.in_flight -= 1
+
+    async def _run_io(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._io_pool, fn, *args)
+
+    # ----------------- Connection handling -----------------
+    async def _handle(self, reader, writer):
+        admitted = False
+        try:
+            method, target, headers = await asyncio.wait_for(self._read_head(reader), READ_TIMEOUT_SECONDS)
+            url = urlsplit(target)
+            query = parse_qs(url.query)
+
+            if url.path == "/health":
+                await self._send_json(writer, HTTPStatus.OK, {"status": "ok", "in_flight": self.in_flight})
+                return
+            if url.path == "/metrics":
+                body = metrics.render().encode("utf-8")
+                writer.write(self._head(HTTPStatus.OK, "text/plain; version=0.0.4",
+                                        {"Content-Length": str(len(body))}) + body)
+                await writer.drain()
+                return
+            if self.in_flight >= self.max_in_flight:
+                await self._send_json(writer, HTTPStatus.TOO_MANY_REQUESTS, {"error": "server busy, retry later"},
+                                      extra_headers={"Retry-After": "1"})
+                return
+            self.in_flight += 1
+            admitted = True
+
+            if url.path == "/analyze" and method == "POST":
+                body = await self._read_body(reader, headers)
+                await self._analyze(writer, query, body)
+            elif url.path == "/score-all" and method == "POST":
+                body = await self._read_body(reader, headers)
+                top_n = _count_param(query, "top_n", 10, MAX_TOP_N)
+                ranking, profile_path = await self._run_cpu(_score_pdf, body, top_n, _param(query, "profile") == "1")
+                await self._send_json(writer, HTTPStatus.OK, {"roles": ranking}, _profile_header(profile_path))
+            elif url.path == "/history" and method == "GET":
+                await self._stream_history(writer, query)
+            elif url.path == "/jobs" and method == "POST":
+                body = await self._read_body(reader, headers)
+                await self._submit_job(writer, query, body)
+            elif url.path.startswith("/jobs/") and method == "GET":
+                job = await self._run_io(backend.get_job, url.path[len("/jobs/"):])
+                if job is None:
+                    raise HTTPError(HTTPStatus.NOT_FOUND, "unknown job")
+                await self._send_json(writer, HTTPStatus.OK, job)
+            elif url.path in ("/analyze", "/score-all", "/history", "/jobs") or url.path.startswith("/jobs/"):
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "method not allowed")
+            else:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "not found")
+        except HTTPError as e:
+            await self._send_json(writer, e.status, {"error": e.message})
+        except pdf_extract.PDFLimitError as e:
+            await self._send_json(writer, HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(e)})
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            await self._send_json(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"})
+        finally:
+            if admitted:
+                self.in_flight -= 1
+            writer.close()
+
+    async def _read_head(self, reader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "headers too large")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        return method.upper(), target, headers
+
+    async def _read_body(self, reader, headers):
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+        if length <= 0:
+            raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "PDF body with Content-Length required")
+        if length > pdf_extract.MAX_PDF_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "PDF too large")
+        return await asyncio.wait_for(reader.readexactly(length), READ_TIMEOUT_SECONDS)
+
+    # ----------------- Endpoints -----------------
+    async def _analyze(self, writer, query, body):
+        company, designation, experience = _role_params(query)
+        (result, fp), profile_path = await self._run_cpu(
+            _analyze_pdf, body, company, designation, experience, _param(query, "profile") == "1"
+        )
+        if _param(query, "save", "1") != "0":
+            name = _param(query, "name", "")
+            saved = await self._run_io(backend.save_fingerprinted, name, company, designation, experience, result, fp)
+            result = dict(result, saved=saved)
+        await self._send_json(writer, HTTPStatus.OK, result, _profile_header(profile_path))
+
+    async def _submit_job(self, writer, query, body):
+        company, designation, experience = _role_params(query)
+        priority = _param(query, "priority", "interactive")
+        if priority not in ("interactive", "bulk"):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "priority must be interactive or bulk")
+        name = _param(query, "name", "")
+        job_id = await self._run_io(lambda: backend.submit_analysis(
+            name, body, company, designation, experience,
+            rank_all=_param(query, "rank_all") == "1",
+            # Without an explicit user, limits apply per client address
+            user=_param(query, "user") or writer.get_extra_info("peername", ("",))[0],
+            priority=jobs.PRIORITY_BULK if priority == "bulk" else jobs.PRIORITY_INTERACTIVE,
+        ))
+        await self._send_json(writer, HTTPStatus.ACCEPTED, {"job_id": job_id, "status_url": f"/jobs/{job_id}"})
+
+    async def _stream_history(self, writer, query):
+        filters = dict(
+            company=_param(query, "company"),
+            designation=_param(query, "designation"),
+            experience=_param(query, "experience"),
+            min_score=_int_param(query, "min_score"),
+            max_score=_int_param(query, "max_score"),
+            collapse_duplicates=_param(query, "collapse") == "1",
+        )
+        max_rows = _count_param(query, "max_rows", 10000, MAX_HISTORY_ROWS)
+
+        def page(cursor, sent):
+            return self._run_io(lambda: backend.get_history_page(
+                before_id=cursor, limit=min(HISTORY_PAGE_SIZE, max_rows - sent), **filters))
+
+        # The first page is read before the 200 goes out, so a failing query
+        # still gets a proper error response
+        rows, cursor = await page(None, 0)
+        writer.write(self._head(HTTPStatus.OK, "application/x-ndjson", {"Transfer-Encoding": "chunked"}))
+        sent = 0
+        while True:
+            if rows:
+                chunk = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                # Wait for slow clients instead of buffering the whole history in memory
+                await writer.drain()
+                sent += len(rows)
+            if cursor is None or sent >= max_rows:
+                break
+            try:
+                rows, cursor = await page(cursor, sent)
+            except Exception:
+                # Too late for an error status: close without the last chunk,
+                # which clients see as a truncated body
+                return
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    # ----------------- Responses -----------------
+    def _head(self, status, content_type, extra_headers=None):
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Type: {content_type}", "Connection: close"]
+        lines += [f"{key}: {value}" for key, value in (extra_headers or {}).items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send_json(self, writer, status, payload, extra_headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Length": str(len(body))}
+        headers.update(extra_headers or {})
+        writer.write(self._head(status, "application/json", headers) + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def _serve(args):
+    server = await AnalyzerServer(args.host, args.port, args.max_in_flight, args.workers, args.job_workers).start()
+    print(f"Resume analyzer API listening on http://{server.host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP API for the resume analyzer.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT)
+    parser.add_argument("--workers", type=int, default=None, help="PDF/scoring processes (default: CPU count)")
+    parser.add_argument("--job-workers", type=int, default=jobs.DEFAULT_WORKERS,
+                        help="background job threads for /jobs (0 = leave them to `python jobs.py`)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
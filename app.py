@@ -1,12 +1,33 @@
+import pandas as pd
 import streamlit as st
-from backend import extract_text_from_pdf, analyze_resume, save_result, get_history, COMPANY_REQUIREMENTS
+import metrics
+from backend import submit_analysis, get_job, start_job_workers, get_history_page, get_report, search_candidates, get_catalog, COMPANY_REQUIREMENTS
+
+HISTORY_PAGE_SIZE = 50
 
 # Page config
 st.set_page_config(page_title="AI Resume Analyzer", layout="centered")
 
-# Load your CSS once
-with open('styles.css') as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+# Prometheus export if RESUME_METRICS_PORT / RESUME_METRICS_FILE are set (no-op after the first run)
+metrics.start_exporter()
+
+# Process-wide resources: built on the first script run, reused by every rerun and session
+@st.cache_resource
+def load_css():
+    with open('styles.css') as f:
+        return f"<style>{f.read()}</style>"
+
+# Keyed by the catalog's hash, so a hot-reloaded catalog gets fresh options
+@st.cache_resource
+def catalog_options(digest):
+    current = get_catalog()
+    all_roles = sorted({role for roles in current.requirements.values() for role in roles})
+    return list(current.requirements.keys()), all_roles, list(current.skills)
+
+companies, all_roles, skill_vocabulary = catalog_options(get_catalog().digest)
+
+# The style tag still has to be emitted on every rerun; only the file read is cached
+st.markdown(load_css(), unsafe_allow_html=True)
 
 # Title and description
 st.title("📄 AI Resume Analyzer")
@@ -16,28 +37,72 @@ st.caption("Enhance your resume to match your dream job role and company!")
 with st.form("resume_form"):
     name = st.text_input("👤 Your Name")
     experience = st.radio("💼 Are you a...", ["Fresher", "Experienced"])
-    company = st.selectbox("🏢 Target Company", list(COMPANY_REQUIREMENTS.keys()))
+    company = st.selectbox("🏢 Target Company", companies)
     designation = st.selectbox("🎯 Job Role", list(COMPANY_REQUIREMENTS[company].keys()))
     resume = st.file_uploader("📄 Upload your Resume (PDF only)", type=["pdf"])
+    rank_all = st.checkbox("🌐 Also rank my resume against every company/role")
     submitted = st.form_submit_button("🔍 Submit for Analysis")
 
-# Handle submission and display results
+# Analysis runs on background job workers (jobs.py); started once per server
+# process. Set RESUME_JOB_WORKERS=0 when separate `python jobs.py` workers run.
+@st.cache_resource
+def job_workers():
+    return start_job_workers()
+
+job_workers()
+
+# Handle submission: enqueue it and remember the job id for this session
 if submitted:
     if not name.strip():
         st.error("Please enter your name.")
     elif resume is None:
         st.error("Please upload your resume (PDF format).")
     else:
-        with st.spinner("Analyzing your resume..."):
-            resume_text = extract_text_from_pdf(resume)
-            result = analyze_resume(resume_text, company, designation, experience)
-            save_result(name, company, designation, experience, result)
+        # Open the app with ?profile=1 to cProfile this one submission
+        st.session_state.job_id = submit_analysis(
+            name, resume.getvalue(), company, designation, experience,
+            rank_all=rank_all, profile=st.query_params.get("profile") == "1",
+        )
+
+# Polls only this fragment until the job finishes, then reruns the page to show it
+@st.fragment(run_every=1)
+def job_status(job_id):
+    job = get_job(job_id)
+    if job is None or job["status"] in ("done", "failed"):
+        st.rerun()
+    elif job["status"] == "queued":
+        st.info(f"⏳ Your resume is queued (position {job['position'] + 1})...")
+    else:
+        st.info("🔍 Analyzing your resume...")
+
+job = get_job(st.session_state.job_id) if st.session_state.get("job_id") else None
+if job is not None:
+    if job["status"] in ("queued", "running"):
+        job_status(job["id"])
+    elif job["status"] == "failed":
+        st.error(f"⚠️ Could not process this PDF: {job['error']}")
+    else:
+        output = job["result"]
+        result, saved, best_fit = output["result"], output["saved"], output["best_fit"]
+        if output.get("profile"):
+            st.caption(f"Profile written to {output['profile']}")
+
+        if saved["duplicate"] == "exact":
+            st.info("♻️ This is the same resume you submitted before, so your previous analysis is shown.")
+        elif saved["duplicate"] and not saved["stored"]:
+            st.info("♻️ This resume is nearly identical to your previous submission and scores the same.")
 
         st.markdown("### 🎯 Skill Match Score")
         st.success(f"✅ Your Score: {result['score']}%")
+        if result.get("relevance") is not None:
+            st.caption(f"Relevance: {result['relevance']}/100 (weighs how often and how specific the matched skills are)")
 
         st.markdown("### 🧠 Skills Found")
-        st.markdown(", ".join(result['skills_found']) or "❌ None found")
+        locations = result.get("skill_locations", {})
+        st.markdown(", ".join(
+            f"{skill} ({', '.join(locations[skill])})" if locations.get(skill) else skill
+            for skill in result['skills_found']
+        ) or "❌ None found")
 
         st.markdown("### ⚠️ Suggestions")
         for tip in result["tips"]:
@@ -50,6 +115,20 @@ if submitted:
             st.markdown("### ✍️ Career Objective Suggestion")
             st.success(result["career_objective"])
 
+        if best_fit:
+            st.markdown("### 🌐 Best-Fit Roles Across All Companies")
+            st.table([
+                {
+                    "Company": row["company"],
+                    "Role": row["designation"],
+                    "Score": f"{row['score']}%",
+                    "Relevance": row.get("relevance", "-"),
+                    "Skills Found": ", ".join(row["skills_found"]) or "-",
+                    "Missing": ", ".join(row["missing"]) or "-",
+                }
+                for row in best_fit
+            ])
+
         st.markdown("---")
         st.markdown("### 🛠️ Useful AI Resume Tools")
         st.markdown("""
@@ -63,10 +142,68 @@ if submitted:
 
 # Optional admin panel for past results
 with st.expander("🧾 Admin: View Past Analyses"):
-    history = get_history()
+    col1, col2, col3 = st.columns(3)
+    f_company = col1.selectbox("Company", ["All"] + companies, key="h_company")
+    role_options = list(COMPANY_REQUIREMENTS[f_company].keys()) if f_company != "All" else all_roles
+    f_role = col2.selectbox("Role", ["All"] + role_options, key="h_role")
+    f_experience = col3.selectbox("Experience", ["All", "Fresher", "Experienced"], key="h_experience")
+    f_score = st.slider("Score range", 0, 100, (0, 100), key="h_score")
+    f_dates = st.date_input("Date range", value=(), key="h_dates")
+    f_collapse = st.checkbox("Collapse resubmissions of the same resume", value=True, key="h_collapse")
+
+    filters = dict(
+        company=None if f_company == "All" else f_company,
+        designation=None if f_role == "All" else f_role,
+        experience=None if f_experience == "All" else f_experience,
+        min_score=f_score[0] if f_score[0] > 0 else None,
+        max_score=f_score[1] if f_score[1] < 100 else None,
+        date_from=f_dates[0] if len(f_dates) > 0 else None,
+        date_to=f_dates[1] if len(f_dates) > 1 else None,
+        collapse_duplicates=f_collapse,
+    )
+    # Page cursors are a stack of keyset "before_id" values; reset when filters change
+    if st.session_state.get("h_filters") != filters:
+        st.session_state.h_filters = filters
+        st.session_state.h_cursors = [None]
+
+    history, next_cursor = get_history_page(before_id=st.session_state.h_cursors[-1], limit=HISTORY_PAGE_SIZE, **filters)
     if history:
-        st.markdown("#### Analysis History:")
-        for row in history:
-            st.write(f"{row[5]} - {row[0]} ({row[3]}) → {row[1]} / {row[2]} — Score: {row[4]}%")
+        st.markdown(f"#### Analysis History (page {len(st.session_state.h_cursors)}):")
+        st.dataframe(history, hide_index=True)
     else:
         st.info("No records found.")
+
+    prev_col, next_col = st.columns(2)
+    if prev_col.button("⬅️ Newer", disabled=len(st.session_state.h_cursors) == 1):
+        st.session_state.h_cursors.pop()
+        st.rerun()
+    if next_col.button("Older ➡️", disabled=next_cursor is None):
+        st.session_state.h_cursors.append(next_cursor)
+        st.rerun()
+
+# Reporting dashboard, read from the rollup tables kept up to date on every save
+with st.expander("📊 Reports"):
+    r_company = st.selectbox("Company", ["All"] + companies, key="r_company")
+    report = get_report(company=None if r_company == "All" else r_company)
+    if not report["role_scores"]:
+        st.info("No analyses yet.")
+    else:
+        st.markdown("#### Average Score per Role")
+        st.dataframe(report["role_scores"], hide_index=True)
+        if report["missing_skills"]:
+            st.markdown("#### Most Commonly Missing Skills")
+            st.bar_chart(pd.DataFrame(report["missing_skills"]).set_index("skill")["missing"])
+        if report["volume"]:
+            st.markdown("#### Submissions per Day (last 90 days)")
+            st.line_chart(pd.DataFrame(report["volume"]).set_index("day")[["submissions", "resubmissions"]])
+
+# Recruiter search over the normalized skill index
+with st.expander("🔎 Recruiter: Find Candidates by Skills"):
+    wanted = st.multiselect("Candidates who have ALL of these skills", skill_vocabulary, key="s_skills")
+    s_min_score = st.slider("Minimum score", 0, 100, 0, key="s_min_score")
+    if wanted:
+        matches = search_candidates(wanted, min_score=s_min_score or None, limit=HISTORY_PAGE_SIZE)
+        if matches:
+            st.dataframe(matches, hide_index=True)
+        else:
+            st.info("No candidates match all of these skills.")
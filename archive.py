@@ -0,0 +1,111 @@
+# archive.py
+#
+# Moves old analyses out of the live resume_results table into Parquet files
+# partitioned by month (hive layout, so pandas/pyarrow can prune by month):
+#   archive/resume_results/month=2025-06/part-0000000101-0000000250.parquet
+#
+#   python archive.py --older-than-days 180     # move rows, e.g. from cron
+#   python archive.py --show                    # rows per archived month
+#
+# Only rows the reporting rollups have already counted are archived, so the
+# dashboard totals (rollups.py) still include them. File names come from the
+# ids they hold and each chunk is written before its rows are deleted, so an
+# interrupted run can simply be repeated.
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+import fingerprint
+import rollups
+import skill_index
+
+ARCHIVE_DIR = "archive"
+ARCHIVE_AFTER_DAYS = 180
+ARCHIVE_CHUNK = 5000
+COLUMNS = ["id", "name", "experience", "company", "designation", "skills_found", "score", "suggestions",
+           "ats_format", "date_analyzed"]
+
+
+def _table_dir(directory):
+    return os.path.join(directory, "resume_results")
+
+
+def _delete(conn, result_ids):
+    skill_index.remove_results(conn, result_ids)
+    fingerprint.remove_results(conn, result_ids)
+    conn.executemany("DELETE FROM resume_results WHERE id = ?", [(result_id,) for result_id in result_ids])
+
+
+def archive_before(storage, cutoff, directory=ARCHIVE_DIR, chunk=ARCHIVE_CHUNK):
+    import pandas as pd
+
+    total = 0
+    while True:
+        counted = rollups.watermark(storage.connection())
+        rows = storage.query(
+            f'''
+            SELECT {", ".join(COLUMNS)} FROM resume_results
+            WHERE date_analyzed < ? AND id <= ? ORDER BY date_analyzed, id LIMIT ?
+            ''',
+            (cutoff, counted, chunk)
+        )
+        if not rows:
+            return total
+        frame = pd.DataFrame(rows, columns=COLUMNS)
+        for month, part in frame.groupby(frame["date_analyzed"].str[:7]):
+            month_dir = os.path.join(_table_dir(directory), f"month={month}")
+            os.makedirs(month_dir, exist_ok=True)
+            name = f"part-{part['id'].min():010d}-{part['id'].max():010d}.parquet"
+            # Dot-prefixed temp files are skipped by pyarrow dataset discovery
+            tmp = os.path.join(month_dir, f".{name}.tmp")
+            part.to_parquet(tmp, index=False)
+            os.replace(tmp, os.path.join(month_dir, name))
+        ids = frame["id"].tolist()
+        storage.write(lambda conn: _delete(conn, ids))
+        total += len(ids)
+
+
+def archive_older_than(storage, days=ARCHIVE_AFTER_DAYS, directory=ARCHIVE_DIR):
+    cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    return archive_before(storage, cutoff, directory)
+
+
+# Archived rows as a DataFrame; `months` (e.g. ["2025-06"]) limits which
+# partitions are read at all.
+def read_archive(directory=ARCHIVE_DIR, months=None, columns=None):
+    import pandas as pd
+
+    path = _table_dir(directory)
+    if not os.path.isdir(path):
+        return pd.DataFrame(columns=columns or COLUMNS + ["month"])
+    filters = [("month", "in", list(months))] if months else None
+    return pd.read_parquet(path, columns=columns, filters=filters)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive old analyses to partitioned Parquet files.")
+    parser.add_argument("--older-than-days", type=int, default=ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--dir", default=ARCHIVE_DIR)
+    parser.add_argument("--show", action="store_true", help="only print archived rows per month")
+    args = parser.parse_args(argv)
+
+    if args.show:
+        frame = read_archive(args.dir, columns=["id", "month"])
+        for month, count in frame.groupby("month", observed=True).size().items():
+            print(f"{month}: {count} rows")
+        return 0
+
+    import backend
+
+    db = backend.get_db()
+    # Let the rollups catch up first; only rows they have counted are archived
+    rollups.backfill(db)
+    moved = archive_older_than(db, args.older_than_days, args.dir)
+    print(f"archived {moved} rows older than {args.older_than_days} days to {args.dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
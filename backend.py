@@ -1,396 +1,183 @@
 # backend.py
+#
+# Importing this module is deliberately cheap: pdfplumber, the SQLite
+# connections, the PDF text cache and the compiled skill matcher are all
+# created on first use (once per process) by the get_* helpers below.
 
-import pdfplumber
-import sqlite3
-from datetime import datetime
-import re
+import time
+_import_started = time.perf_counter()
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+import threading
+import metrics
+from pdf_cache import TextCache, content_key
+from pdf_extract import PDFLimitError, PDFWorkerError, extract_text
+import skill_index
+import storage
+import catalog
+import fingerprint
+import rollups
+import rules
+import jobs
+from sections import ResumeSections
+
+# ----------- Section index: one segmentation per resume text ----------
+# analyze_resume, analyze_projects and score_all_roles all read the same
+# ResumeSections, so a submission segments, matches and tokenizes the text
+# once. Keyed by the catalog object too, so a reload re-matches.
+def segment_resume(text):
+    return _segment(text, catalog.current())
+
+@lru_cache(maxsize=32)
+def _segment(text, current):
+    return ResumeSections(text, current.matcher, current.alias_forms)
 
-# ----------- New helper: Extract project section text ----------
 def extract_project_section(text):
-    # Simple heuristic: look for "project" section (case-insensitive)
-    match = re.search(r'(projects|project experience|academic projects|personal projects)(.*?)(\n\n|\Z)', text, re.S | re.I)
-    if match:
-        return match.group(2).strip()
-    return ""
+    return segment_resume(text).text_of("projects")
 
-# ----------- New: Analyze projects relevance for fresher ----------
+# ----------- Analyze projects relevance for fresher ----------
+# The same check analyze_resume runs for freshers (rules.ProjectsRule)
 def analyze_projects(text, desired_skills):
-    project_section = extract_project_section(text)
-    if not project_section:
-        return ["⚠️ No Projects section found. Consider adding detailed projects relevant to your desired job role."]
-    
-    # Check if any desired skill words appear in projects
-    skills_mentioned = [skill for skill in desired_skills if skill.lower() in project_section.lower()]
-    
-    if not skills_mentioned:
-        return ["⚠️ Your project descriptions don't highlight key skills for the job role. Add technologies/tools used in projects."]
-    
-    return [f"✅ Projects highlight these relevant skills: {', '.join(skills_mentioned)}"]
-
-# ----------- Updated evaluate_resume function to include project check ----------
-def evaluate_resume(text, company, designation, experience):
-    company_roles = COMPANY_DATA.get(company, {})
-    role_skills = company_roles.get(designation, {}).get(experience.lower(), [])
-
-    found_skills = [skill for skill in role_skills if skill in text]
-    missing_skills = [skill for skill in role_skills if skill not in text]
-
-    score = int((len(found_skills) / len(role_skills)) * 100) if role_skills else 0
-
-    ats_feedback = []
-    if "objective" not in text and "summary" not in text:
-        ats_feedback.append("Include an Objective or Summary section.")
-    if "experience" not in text and experience.lower() == "experienced":
-        ats_feedback.append("Add an Experience section.")
-    if "education" not in text:
-        ats_feedback.append("Add an Education section.")
-    if len(text) < 500:
-        ats_feedback.append("Your resume content looks too short. Add more details.")
-
-    ats_format = "\n".join(ats_feedback) if ats_feedback else "ATS format looks good."
-
-    career_obj = CAREER_OBJECTIVES.get(company, {}).get(designation, "Write a concise, tailored career objective for this role.")
-
-    tips = [f"Add more details about your experience with '{skill}'." for skill in missing_skills]
-
-    # --- Project analysis for freshers ---
-    project_tips = []
-    if experience.lower() == "fresher":
-        project_tips = analyze_projects(text, role_skills)
-
-    # Combine tips
-    all_tips = tips + project_tips
-
-    return {
-        "skills_found": found_skills,
-        "missing": missing_skills,
-        "score": score,
-        "tips": all_tips,
-        "ats_format": ats_format,
-        "career_objective": career_obj
-    }
+    return [rules.project_feedback(segment_resume(text), desired_skills)]
 
 # ----------------- Database Setup -----------------
-conn = sqlite3.connect("resume_analysis.db", check_same_thread=False)
-cursor = conn.cursor()
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS resume_results (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT,
-        experience TEXT,
-        company TEXT,
-        designation TEXT,
-        skills_found TEXT,
-        score INTEGER,
-        suggestions TEXT,
-        ats_format TEXT,
-        date_analyzed TEXT
-    )
-''')
-conn.commit()
+# WAL mode, per-thread read connections and group-committed writes (see storage.py).
+# Opened on first use so importing backend doesn't touch the database.
+_db = None
+_db_lock = threading.Lock()
+
+def get_db():
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                _db = storage.Storage(schema=storage.SCHEMA + skill_index.SCHEMA + fingerprint.SCHEMA + rollups.SCHEMA + jobs.SCHEMA)
+                # Index rows saved before the skill store / rollups / current fingerprint
+                # bands existed (resumable, no-op once done)
+                threading.Thread(target=_backfill, args=(_db,), name="backfill", daemon=True).start()
+    return _db
+
+def _backfill(db):
+    try:
+        skill_index.backfill(db)
+        rollups.backfill(db)
+        fingerprint.rebucket(db)
+    except RuntimeError:
+        # Storage closed at exit mid-backfill; the next start resumes it
+        if not db._closed:
+            raise
 
 # ----------------- Company & Job Role Skills -----------------
-COMPANY_REQUIREMENTS = {
-    "TCS": {
-        "Software Developer": ["java", "spring", "git", "mysql", "rest api", "oop"],
-        "System Engineer": ["linux", "networking", "troubleshooting", "shell scripting", "tcp/ip"],
-        "IT Support Trainee": ["customer support", "troubleshooting", "communication", "hardware basics"],
-        "Data Analyst Trainee": ["excel", "sql","python" "power bi", "data visualization", "statistics"],
-        "Business Analyst": ["requirement gathering", "ppt", "communication", "uml", "stakeholder management"],
-        "HR Executive": ["recruitment", "interviewing", "communication", "ms office"],
-        "QA Tester": ["manual testing", "test cases", "jira", "automation basics"],
-        "Project Coordinator": ["planning", "communication", "risk management", "agile"],
-        "Finance Associate": ["accounting", "ms excel", "sap", "invoice processing"],
-        "Marketing Executive": ["seo", "content creation", "social media", "digital marketing"]
-    },
-    "Infosys": {
-        "Java Developer": ["java", "spring boot", "hibernate", "sql", "maven", "microservices"],
-        "Python Developer": ["python", "flask", "django", "rest api", "sql", "oop"],
-        "HR Associate": ["recruitment", "onboarding", "communication", "employee engagement"],
-        "Data Scientist": ["python", "machine learning", "pandas", "numpy", "statistics", "tensorflow"],
-        "IT Support Engineer": ["networking", "troubleshooting", "windows server", "customer support"],
-        "Business Analyst": ["business process", "ppt", "excel", "stakeholder communication", "uml"],
-        "Cloud Engineer": ["aws", "azure", "docker", "kubernetes"],
-        "Automation Tester": ["selenium", "java", "cucumber", "test automation"],
-        "Technical Writer": ["documentation", "communication", "ms office", "editing"],
-        "Sales Executive": ["lead generation", "crm", "communication", "negotiation"]
-    },
-    "Accenture": {
-        "Data Analyst": ["python", "sql", "excel", "tableau", "power bi", "statistics"],
-        "Business Analyst": ["excel", "communication", "sql", "ppt", "uml", "stakeholder management"],
-        "Cloud Consultant": ["aws", "azure", "terraform", "docker", "ci/cd"],
-        "Software Tester": ["selenium", "java", "test cases", "jira", "manual testing"],
-        "Project Manager": ["project management", "communication", "risk management", "agile", "scrum"],
-        "Cybersecurity Analyst": ["firewalls", "penetration testing", "security", "incident response", "network security"],
-        "DevOps Engineer": ["jenkins", "docker", "kubernetes", "linux", "ansible"],
-        "UI/UX Designer": ["figma", "prototyping", "adobe xd", "user research", "wireframing"],
-        "HR Coordinator": ["recruitment", "communication", "ms office", "employee relations"],
-        "Content Strategist": ["seo", "content creation", "editing", "analytics"]
-    },
-    "Wipro": {
-        "Cloud Engineer": ["aws", "azure", "linux", "docker", "kubernetes", "terraform"],
-        "Test Engineer": ["selenium", "java", "jira", "test cases", "automation"],
-        "IT Support": ["hardware", "networking", "customer support", "troubleshooting"],
-        "Data Analyst": ["excel", "sql", "power bi", "data visualization", "statistics"],
-        "BPO Executive": ["communication", "ms office", "crm", "customer service"],
-        "DevOps Engineer": ["jenkins", "docker", "kubernetes", "linux", "ansible"],
-        "Technical Recruiter": ["recruitment", "interviewing", "communication", "sourcing"],
-        "Finance Analyst": ["accounting", "ms excel", "sap", "financial reporting"],
-        "Network Engineer": ["routing", "switching", "ccna", "firewalls"],
-        "Marketing Analyst": ["market research", "data analysis", "excel", "digital marketing"]
-    },
-    "Capgemini": {
-        "DevOps Engineer": ["jenkins", "docker", "kubernetes", "linux", "ansible", "terraform"],
-        "Support Analyst": ["ticketing", "communication", "sql", "troubleshooting"],
-        "Finance Associate": ["excel", "sap", "invoice", "accounting", "financial analysis"],
-        "Software Developer": ["java", "spring", "hibernate", "rest api", "oop"],
-        "HR Associate": ["recruitment", "communication", "ms office", "employee engagement"],
-        "Business Analyst": ["ppt", "excel", "communication", "stakeholder management", "uml"],
-        "Cloud Engineer": ["aws", "azure", "terraform", "docker"],
-        "QA Tester": ["manual testing", "automation", "selenium", "jira"],
-        "Data Scientist": ["python", "machine learning", "sql", "statistics", "tensorflow"],
-        "Technical Writer": ["documentation", "communication", "ms office", "editing"]
-    },
-    "Tech Mahindra": {
-        "Frontend Developer": ["html", "css", "javascript", "react", "redux"],
-        "BPO Executive": ["communication", "ms office", "crm", "customer handling"],
-        "Business Support": ["data entry", "ppt", "customer interaction", "excel"],
-        "Backend Developer": ["nodejs", "express", "mongodb", "api"],
-        "QA Tester": ["manual testing", "automation", "selenium", "jira"],
-        "Cloud Engineer": ["aws", "azure", "docker", "kubernetes"],
-        "HR Executive": ["recruitment", "onboarding", "communication"],
-        "Data Analyst": ["excel", "sql", "power bi", "data visualization"],
-        "Technical Writer": ["documentation", "editing", "communication"],
-        "Sales Executive": ["crm", "lead generation", "communication"]
-    },
-    "Cognizant": {
-        "Automation Tester": ["selenium", "java", "cucumber", "test automation"],
-        "Backend Developer": ["nodejs", "api", "mongodb", "express"],
-        "KPO Analyst": ["research", "excel", "reporting", "communication"],
-        "Data Analyst Trainee": ["excel", "sql","python" "power bi", "data visualization", "statistics"],
-        "Data Scientist": ["python", "machine learning", "statistics", "sql"],
-        "Business Analyst": ["ppt", "excel", "stakeholder communication"],
-        "Cloud Engineer": ["aws", "azure", "terraform", "docker"],
-        "HR Associate": ["recruitment", "communication", "ms office"],
-        "Support Engineer": ["customer support", "troubleshooting", "communication"],
-        "QA Tester": ["manual testing", "automation", "selenium"],
-        "Technical Writer": ["documentation", "communication", "editing"]
-    },
-    "IBM": {
-        "AI Engineer": ["python", "machine learning", "deep learning", "tensorflow", "pytorch"],
-        "Consultant": ["problem solving", "communication", "project management"],
-        "Database Admin": ["oracle", "sql", "performance tuning", "backup recovery"],
-        "Cloud Architect": ["aws", "azure", "gcp", "terraform"],
-        "Cybersecurity Analyst": ["firewalls", "penetration testing", "incident response"],
-        "Software Developer": ["java", "spring", "hibernate", "rest api"],
-        "HR Executive": ["recruitment", "communication", "ms office"],
-        "Data Scientist": ["python", "statistics", "sql", "machine learning"],
-        "Technical Writer": ["documentation", "editing", "communication"],
-        "Project Manager": ["project management", "risk management", "agile", "scrum"]
-    },
-    "HCL": {
-        "Technical Support": ["communication", "network", "troubleshooting", "customer support"],
-        "Data Entry": ["typing", "ms excel", "accuracy"],
-        "NOC Engineer": ["linux", "monitoring", "incident management", "networking"],
-        "Cloud Engineer": ["aws", "azure", "docker", "kubernetes"],
-        "QA Tester": ["selenium", "manual testing", "automation"],
-        "Business Analyst": ["ppt", "excel", "communication"],
-        "HR Assistant": ["recruitment", "communication", "ms office"],
-        "Software Developer": ["java", "spring", "hibernate", "rest api"],
-        "Data Analyst": ["excel", "sql", "power bi"],
-        "Project Coordinator": ["planning", "communication", "risk management"]
-    },
-    "Google": {
-        "Software Engineer": ["c++", "algorithms", "system design", "data structures"],
-        "ML Engineer": ["python", "machine learning", "tensorflow", "pandas", "numpy"],
-        "UX Designer": ["figma", "prototyping", "user testing", "wireframing"],
-        "Product Manager": ["agile", "scrum", "communication", "roadmapping"],
-        "Cloud Architect": ["gcp", "aws", "terraform", "docker"],
-        "Data Scientist": ["python", "statistics", "machine learning"],
-        "Technical Writer": ["documentation", "editing", "communication"],
-        "Sales Engineer": ["crm", "lead generation", "communication"],
-        "Support Engineer": ["customer support", "troubleshooting", "communication"],
-        "Recruiter": ["recruitment", "interviewing", "communication"]
-    },
-    "Microsoft": {
-        "Software Developer": ["c#", ".net", "sql", "azure", "oop"],
-        "Security Analyst": ["firewalls", "siem", "threat analysis", "incident response"],
-        "Content Strategist": ["seo", "blog", "editing", "content marketing"],
-        "Cloud Engineer": ["azure", "aws", "terraform", "docker"],
-        "Data Scientist": ["python", "machine learning", "statistics"],
-        "UX Designer": ["figma", "adobe xd", "prototyping", "user research"],
-        "HR Executive": ["recruitment", "communication", "ms office"],
-        "Project Manager": ["project management", "agile", "scrum", "risk management"],
-        "QA Tester": ["manual testing", "automation", "selenium"],
-        "Technical Writer": ["documentation", "editing", "communication"]
-    },
-    "Amazon": {
-        "Cloud Architect": ["aws", "terraform", "ci/cd", "docker"],
-        "Operations Executive": ["excel", "sql", "erp", "communication"],
-        "Customer Support": ["communication", "crm", "problem solving"],
-        "Data Analyst": ["excel", "sql", "power bi", "data visualization"],
-        "Software Developer": ["java", "spring", "hibernate", "rest api"],
-        "Logistics Manager": ["supply chain", "excel", "communication"],
-        "Product Manager": ["agile", "scrum", "roadmapping"],
-        "HR Associate": ["recruitment", "onboarding", "communication"],
-        "QA Engineer": ["selenium", "manual testing", "automation"],
-        "Marketing Specialist": ["seo", "content marketing", "social media"]
-    },
-    "Deloitte": {
-        "Data Scientist": ["python", "statistics", "sql", "visualization", "machine learning"],
-        "Consulting Analyst": ["communication", "ppt", "excel", "stakeholder management"],
-        "IT Auditor": ["audit", "risk", "information systems", "compliance"],
-        "Tax Consultant": ["taxation", "accounting", "ms excel"],
-        "Financial Analyst": ["accounting", "financial modeling", "ms excel"],
-        "Business Analyst": ["business process", "communication", "ppt"],
-        "Cybersecurity Analyst": ["firewalls", "penetration testing", "incident response"],
-        "Project Manager": ["project management", "risk management", "agile"],
-        "HR Executive": ["recruitment", "communication", "employee relations"],
-        "Technical Writer": ["documentation", "editing", "communication"]
-    },
-    "EY": {
-        "Finance Analyst": ["ms excel", "accounting", "erp", "financial reporting"],
-        "Auditor": ["audit", "tax", "reporting", "compliance"],
-        "Compliance Officer": ["legal", "compliance", "reporting"],
-        "Business Analyst": ["communication", "excel", "ppt", "stakeholder management"],
-        "Tax Consultant": ["taxation", "accounting", "compliance"],
-        "HR Associate": ["recruitment", "communication", "ms office"],
-        "IT Consultant": ["project management", "cloud", "itil"],
-        "Data Scientist": ["python", "machine learning", "statistics"],
-        "Cybersecurity Analyst": ["security", "penetration testing", "incident response"],
-        "Technical Writer": ["documentation", "communication", "editing"]
-    },
-    "KPMG": {
-        "Risk Consultant": ["ms excel", "compliance", "analysis", "risk management"],
-        "HR Assistant": ["recruitment", "hrms", "communication"],
-        "IT Consultant": ["project management", "itil", "cloud", "devops"],
-        "Audit Associate": ["audit", "financial statements", "reporting"],
-        "Business Analyst": ["communication", "ppt", "excel"],
-        "Cybersecurity Analyst": ["security", "penetration testing", "incident response"],
-        "Data Analyst": ["sql", "excel", "power bi"],
-        "Tax Consultant": ["tax", "accounting", "compliance"],
-        "Technical Writer": ["documentation", "editing", "communication"],
-        "Project Manager": ["project management", "agile", "risk management"]
-    },
-    "IBM": {
-        "AI Engineer": ["python", "machine learning", "deep learning", "tensorflow", "pytorch"],
-        "Consultant": ["problem solving", "communication", "project management"],
-        "Database Admin": ["oracle", "sql", "performance tuning", "backup recovery"],
-        "Cloud Architect": ["aws", "azure", "gcp", "terraform"],
-        "Cybersecurity Analyst": ["firewalls", "penetration testing", "incident response"],
-        "Software Developer": ["java", "spring", "hibernate", "rest api"],
-        "HR Executive": ["recruitment", "communication", "ms office"],
-        "Data Scientist": ["python", "statistics", "sql", "machine learning"],
-        "Technical Writer": ["documentation", "editing", "communication"],
-        "Project Manager": ["project management", "risk management", "agile", "scrum"]
-    },
-    "Oracle": {
-        "Database Developer": ["sql", "pl/sql", "performance tuning", "oracle forms"],
-        "Java Developer": ["java", "spring", "hibernate", "rest api"],
-        "Cloud Engineer": ["oci", "terraform", "docker", "kubernetes"],
-        "Support Engineer": ["customer support", "troubleshooting", "communication"],
-        "QA Tester": ["manual testing", "automation", "selenium"],
-        "Business Analyst": ["requirement gathering", "ppt", "excel"],
-        "Technical Writer": ["documentation", "editing", "communication"],
-        "HR Executive": ["recruitment", "communication", "ms office"],
-        "Data Scientist": ["python", "machine learning", "statistics"],
-        "Project Manager": ["project management", "agile", "scrum"]
-    },
-    "SAP": {
-        "SAP Consultant": ["sap fi", "sap mm", "configuration", "business process"],
-        "Business Analyst": ["excel", "ppt", "stakeholder communication"],
-        "Project Manager": ["project management", "agile", "communication"],
-        "Support Engineer": ["customer support", "troubleshooting"],
-        "Data Analyst": ["excel", "sql", "power bi"],
-        "QA Tester": ["manual testing", "automation", "selenium"],
-        "Technical Writer": ["documentation", "editing", "communication"],
-        "HR Associate": ["recruitment", "communication", "ms office"],
-        "Finance Analyst": ["accounting", "ms excel", "sap"],
-        "Marketing Executive": ["seo", "content creation", "social media"]
-    },
-    "Facebook": {
-        "Software Engineer": ["c++", "algorithms", "system design"],
-        "Data Scientist": ["python", "machine learning", "statistics"],
-        "Product Manager": ["agile", "scrum", "communication"],
-        "UX Designer": ["figma", "prototyping", "user research"],
-        "Cloud Engineer": ["aws", "azure", "terraform"],
-        "Technical Writer": ["documentation", "editing", "communication"],
-        "HR Executive": ["recruitment", "communication", "ms office"],
-        "Sales Engineer": ["crm", "lead generation", "communication"],
-        "Support Engineer": ["customer support", "troubleshooting", "communication"],
-        "Marketing Specialist": ["seo", "content marketing", "social media"]
-    },
-    "LinkedIn": {
-        "Software Developer": ["java", "spring", "sql", "rest api"],
-        "Data Analyst": ["excel", "sql", "power bi", "data visualization"],
-        "HR Associate": ["recruitment", "communication", "ms office"],
-        "Product Manager": ["agile", "scrum", "roadmapping"],
-        "Marketing Executive": ["seo", "content marketing", "social media"],
-        "QA Tester": ["manual testing", "automation", "selenium"],
-        "Technical Writer": ["documentation", "editing", "communication"],
-        "Sales Executive": ["crm", "lead generation", "communication"],
-        "Cloud Engineer": ["aws", "azure", "terraform"],
-        "UX Designer": ["figma", "prototyping", "wireframing"]
-    }
-}
+# Loaded from skill_catalog.json and hot-reloaded when the file changes (see
+# catalog.py). COMPANY_REQUIREMENTS behaves like the old dict literal but
+# always reads the live catalog.
+COMPANY_REQUIREMENTS = catalog.RequirementsView()
+
+def get_catalog():
+    return catalog.current()
+
+# ----------------- Compiled Skill Matcher -----------------
+# One trie-shaped regex over the whole vocabulary (see skill_matcher.py), so
+# scoring scans the resume once instead of once per expected skill. Compiled
+# with the catalog (and cached on disk by its hash), so a reload swaps in a
+# new matcher without rebuilding it per request.
+def get_skill_matcher():
+    return catalog.current().matcher
+
+def get_role_index():
+    return catalog.current().role_index
 
 # ----------------- Career Objectives by Company and Designation -----------------
-CAREER_OBJECTIVES = {
-    company: {role: f"Aspiring {role} eager to contribute skills and grow at {company}."
-              for role in roles}
-    for company, roles in COMPANY_REQUIREMENTS.items()
-}
+def get_career_objective(company, designation):
+    if designation not in COMPANY_REQUIREMENTS.get(company, {}):
+        return None
+    return f"Aspiring {designation} eager to contribute skills and grow at {company}."
 
 # ----------------- Resume Parsing -----------------
+@lru_cache(maxsize=None)
+def get_pdf_cache():
+    return TextCache()
+
+def read_pdf_bytes(pdf_file):
+    # Accepts a path, raw bytes, a Streamlit UploadedFile or any binary file object
+    if isinstance(pdf_file, (bytes, bytearray)):
+        return bytes(pdf_file)
+    if isinstance(pdf_file, str):
+        with open(pdf_file, "rb") as f:
+            return f.read()
+    if hasattr(pdf_file, "getvalue"):
+        return pdf_file.getvalue()
+    pdf_file.seek(0)
+    return pdf_file.read()
+
+@metrics.timed("extract")
 def extract_text_from_pdf(pdf_file):
-    text = ""
-    with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            content = page.extract_text()
-            if content:
-                text += content
-    return text.lower()
+    data = read_pdf_bytes(pdf_file)
+    key = content_key(data)
+    cache = get_pdf_cache()
+    text = cache.get(key)
+    if text is None:
+        text = parse_pdf_text(data)
+        cache.put(key, text)
+    metrics.TEXT_CHARS.observe(len(text))
+    return text
+
+def parse_pdf_text(data):
+    # Raises PDFLimitError for files over the page/byte/time limits in pdf_extract
+    return extract_text(data).lower()
 
 # ----------------- Resume Evaluation -----------------
+# Skill, ATS format, length and fresher project checks are rules compiled with
+# the catalog (see rules.py); they all read one ResumeSections index.
+@metrics.timed("analyze")
 def analyze_resume(text, company, designation, experience):
-    expected_skills = COMPANY_REQUIREMENTS.get(company, {}).get(designation, [])
-    found_skills = [skill for skill in expected_skills if skill in text]
-    missing_skills = [skill for skill in expected_skills if skill not in text]
-    score = int((len(found_skills) / len(expected_skills)) * 100) if expected_skills else 0
+    # One catalog snapshot per call, so a reload mid-request can't mix versions
+    current = catalog.current()
+    expected_skills = current.requirements.get(company, {}).get(designation, ())
+    segmented = _segment(text, current)
+    outcome = current.rules.evaluate(segmented, company, designation, experience, expected_skills)
+    locations = segmented.locations(outcome.found)
 
-    tips = []
-    for skill in missing_skills:
-        tips.append(f"💡 Add more details about your experience with **{skill}**.")
-
-    ats_feedback = []
-    if "objective" not in text and "summary" not in text:
-        ats_feedback.append("📌 Missing an objective or summary section.")
-    if "experience" not in text and experience.lower() == "experienced":
-        ats_feedback.append("📌 No experience section found.")
-    if "education" not in text:
-        ats_feedback.append("📌 No education section detected.")
-    if len(text) < 500:
-        ats_feedback.append("📌 Resume content too short, consider adding more details.")
+    return {
+        "skills_found": outcome.found,
+        "missing": outcome.missing,
+        "score": outcome.score,
+        # TF-IDF weighted, mention-aware 0-100 score next to the percentage (see relevance.py)
+        "relevance": current.relevance.score(segmented.mentions, company, designation),
+        "tips": outcome.tips,
+        "ats_format": "\n".join(outcome.ats) if outcome.ats else "✅ ATS format looks good.",
+        "career_objective": get_career_objective(company, designation),
+        # Where each found skill appears, e.g. {"sql": ["skills", "projects"]}
+        "skill_locations": {skill: locations[skill] for skill in outcome.found}
+    }
 
-    format_tips = "\n".join(ats_feedback) if ats_feedback else "✅ ATS format looks good."
+# Older name; the project checks it used to add are a rule now
+evaluate_resume = analyze_resume
 
-    career_obj = CAREER_OBJECTIVES.get(company, {}).get(designation, None)
+# ----------------- Score Against Every Company/Role -----------------
+@metrics.timed("score_all")
+def score_all_roles(text, top_n=10):
+    current = catalog.current()
+    segmented = _segment(text, current)
+    ranking = current.role_index.rank(segmented.skills, top_n)
+    relevance = current.relevance.score_all(segmented.mentions)
+    for row in ranking:
+        row["relevance"] = relevance[row["company"], row["designation"]]
+    return ranking
 
-    return {
-        "skills_found": found_skills,
-        "missing": missing_skills,
-        "score": score,
-        "tips": tips,
-        "ats_format": format_tips,
-        "career_objective": career_obj
-    }
+# ----------------- Batch relevance -----------------
+# Relevance of many resume texts for one role, scored as one matrix product
+@metrics.timed("relevance_batch")
+def score_relevance(texts, company, designation):
+    current = catalog.current()
+    model = current.relevance
+    mentions = [_segment(text, current).mentions for text in texts]
+    return [round(float(value), 1) for value in model.score_role(model.vectorize(mentions), company, designation)]
 
 # ----------------- DB Insertion -----------------
-def save_result(name, company, designation, experience, result):
-    cursor.execute('''
-        INSERT INTO resume_results (name, company, designation, experience, skills_found, score, suggestions, ats_format, date_analyzed)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
+def _result_row(name, company, designation, experience, result):
+    return (
         name,
         company,
         designation,
@@ -400,10 +187,206 @@ def save_result(name, company, designation, experience, result):
         ", ".join(result['missing']),
         result['ats_format'],
         datetime.now().strftime("%Y-%m-%d %H:%M")
-    ))
-    conn.commit()
+    )
+
+def _insert_result(conn, row, result):
+    result_id = conn.execute('''
+        INSERT INTO resume_results (name, company, designation, experience, skills_found, score, suggestions, ats_format, date_analyzed)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', row).lastrowid
+    skill_index.index_result(conn, result_id, result['skills_found'], result['missing'])
+    skill_index.advance_backfill(conn, result_id)
+    rollups.add_result(conn, result_id, row[1], row[2], row[5], result['missing'], row[8])
+    return result_id
+
+# Inserts many (name, company, designation, experience, result) records in one
+# transaction without fingerprinting them. Only for rows with no resume text
+# behind them (benchmark fixtures, imports); analyses go through save_results.
+@metrics.timed("save")
+def insert_results(records):
+    rows = [(_result_row(*record), record[4]) for record in records]
+
+    def insert(conn):
+        for row, result in rows:
+            _insert_result(conn, row, result)
+
+    get_db().write(insert)
+
+# ----------------- Duplicate submissions -----------------
+# A resubmission whose stored outcome would not change is not inserted again:
+# exact text matches, and near duplicates (see fingerprint.py) that score the
+# same, only bump the earlier row's submission count. A near duplicate that
+# scores differently is inserted in the earlier row's cluster, so the admin
+# history can collapse it. The lookup runs on the writer thread, so two
+# concurrent copies of one resume can't both be inserted.
+def _same_outcome(previous, result):
+    return all(previous.get(field) == result.get(field) for field in ("score", "skills_found", "missing", "ats_format"))
+
+def _save_fingerprinted(conn, digest, name, company, designation, experience, result, fp):
+    key = fingerprint.dedupe_key(name, company, designation, experience)
+    row = _result_row(name, company, designation, experience, result)
+    match = fingerprint.lookup(conn, key, fp, digest)
+    if match and (match["kind"] == "exact" or _same_outcome(match["analysis"], result)):
+        fingerprint.record_resubmission(conn, match["result_id"])
+        rollups.add_resubmission(conn, row[8])
+        return {"result_id": match["result_id"], "duplicate": match["kind"], "stored": False}
+    result_id = _insert_result(conn, row, result)
+    fingerprint.record(conn, result_id, key, fp, digest, result, match["cluster_id"] if match else None)
+    return {"result_id": result_id, "duplicate": match["kind"] if match else None, "stored": True}
+
+# Saves many (name, company, designation, experience, result, fp) records in
+# one transaction, each deduplicated like save_fingerprinted; returns one
+# saved dict per record.
+@metrics.timed("save")
+def save_results(records):
+    digest = catalog.current().digest
+    saved = get_db().write(lambda conn: [_save_fingerprinted(conn, digest, *record) for record in records])
+    for outcome in saved:
+        kind = outcome["duplicate"] or "new"
+        metrics.DEDUPE_OUTCOMES.inc(outcome=f"{kind}_changed" if outcome["duplicate"] and outcome["stored"] else kind)
+    return saved
+
+def save_fingerprinted(name, company, designation, experience, result, fp):
+    return save_results([(name, company, designation, experience, result, fp)])[0]
+
+# Fingerprint, reuse the stored analysis for an exact resubmission (same
+# candidate, role and catalog), otherwise analyze, then save. Returns
+# (result, saved) where saved is save_fingerprinted's dict.
+def analyze_submission(name, text, company, designation, experience):
+    fp = fingerprint_text(text)
+    key = fingerprint.dedupe_key(name, company, designation, experience)
+    previous = fingerprint.lookup(get_db().connection(), key, fp, catalog.current().digest)
+    if previous and previous["kind"] == "exact":
+        result = previous["analysis"]
+    else:
+        result = analyze_resume(text, company, designation, experience)
+    return result, save_fingerprinted(name, company, designation, experience, result, fp)
+
+@metrics.timed("fingerprint")
+def fingerprint_text(text):
+    return fingerprint.fingerprint(text)
+
+# ----------------- Recruiter: Skill Search -----------------
+@metrics.timed("search")
+def search_candidates(skills, min_score=None, company=None, designation=None, before_id=None, limit=50):
+    rows = skill_index.search_candidates(get_db(), skills, min_score, company, designation, before_id, limit)
+    return [dict(zip(HISTORY_COLUMNS, row)) for row in rows]
 
 # ----------------- Admin: View History -----------------
+@metrics.timed("history")
 def get_history():
-    cursor.execute("SELECT name, company, designation, experience, score, date_analyzed FROM resume_results ORDER BY id DESC")
-    return cursor.fetchall()
+    return get_db().query("SELECT name, company, designation, experience, score, date_analyzed FROM resume_results ORDER BY id DESC")
+
+
+# Keyset-paginated history: pass the returned next_cursor as `before_id` to get
+# the following page. All filters run in SQLite against the indexed columns.
+HISTORY_COLUMNS = ["id", "name", "company", "designation", "experience", "score", "date_analyzed"]
+
+@metrics.timed("history")
+def get_history_page(company=None, designation=None, experience=None, min_score=None, max_score=None,
+                     date_from=None, date_to=None, before_id=None, limit=50, collapse_duplicates=False):
+    # SQLite reads a negative LIMIT as "no limit"
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    where, params = [], []
+    for column, value in (("company", company), ("designation", designation), ("experience", experience)):
+        if value:
+            where.append(f"r.{column} = ?")
+            params.append(value)
+    if min_score is not None:
+        where.append("r.score >= ?")
+        params.append(min_score)
+    if max_score is not None:
+        where.append("r.score <= ?")
+        params.append(max_score)
+    if date_from is not None:
+        where.append("r.date_analyzed >= ?")
+        params.append(date_from.strftime("%Y-%m-%d"))
+    if date_to is not None:
+        where.append("r.date_analyzed < ?")
+        params.append((date_to + timedelta(days=1)).strftime("%Y-%m-%d"))
+    if before_id is not None:
+        where.append("r.id < ?")
+        params.append(before_id)
+
+    # `submissions` counts resubmissions folded into a row; when collapsing, only
+    # the newest row of each near-duplicate cluster is listed, with the cluster total
+    if collapse_duplicates:
+        where.append(
+            "(f.cluster_id IS NULL OR NOT EXISTS "
+            "(SELECT 1 FROM resume_fingerprints g WHERE g.cluster_id = f.cluster_id AND g.result_id > r.id))"
+        )
+        submissions = "COALESCE((SELECT SUM(g.submissions) FROM resume_fingerprints g WHERE g.cluster_id = f.cluster_id), 1)"
+    else:
+        submissions = "COALESCE(f.submissions, 1)"
+
+    sql = f'''
+        SELECT {", ".join(f"r.{column}" for column in HISTORY_COLUMNS)}, {submissions}
+        FROM resume_results r LEFT JOIN resume_fingerprints f ON f.result_id = r.id
+    '''
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY r.id DESC LIMIT ?"
+    rows = get_db().query(sql, params + [limit + 1])
+
+    next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+    return [dict(zip(HISTORY_COLUMNS + ["submissions"], row)) for row in rows[:limit]], next_cursor
+
+# ----------------- Background analysis jobs -----------------
+# The UI and API enqueue uploads here instead of analyzing inline; results are
+# polled with get_job(). See jobs.py for priorities, per-user limits and
+# crash recovery.
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+def get_job_queue():
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = jobs.JobQueue(get_db(), {"analyze": run_analysis_job}, permanent_errors=(PDFLimitError,))
+    return _job_queue
+
+def start_job_workers(workers=jobs.DEFAULT_WORKERS):
+    return get_job_queue().start(workers)
+
+def submit_analysis(name, pdf_bytes, company, designation, experience, rank_all=False, profile=False,
+                    user=None, priority=jobs.PRIORITY_INTERACTIVE):
+    payload = {"name": name, "company": company, "designation": designation, "experience": experience,
+               "rank_all": rank_all, "profile": profile}
+    user = fingerprint.dedupe_key(user if user is not None else name, "", "", "")
+    return get_job_queue().submit("analyze", payload, pdf_bytes, user=user, priority=priority)
+
+def get_job(job_id):
+    return get_job_queue().get(job_id)
+
+def run_analysis_job(payload, pdf_bytes):
+    with metrics.profiled("job", enabled=payload.get("profile", False)) as profile:
+        try:
+            text = extract_text_from_pdf(pdf_bytes)
+        except (PDFLimitError, PDFWorkerError):
+            # Limits fail the job; a lost worker process is retried
+            raise
+        except Exception as e:
+            # A PDF that can't be parsed won't parse on retry either; fail the job right away
+            raise PDFLimitError(f"Unreadable PDF ({type(e).__name__}: {e})") from e
+        result, saved = analyze_submission(payload["name"], text, payload["company"], payload["designation"],
+                                           payload["experience"])
+        best_fit = score_all_roles(text, top_n=10) if payload.get("rank_all") else []
+    return {"result": result, "saved": saved, "best_fit": best_fit, "profile": profile["path"]}
+
+# ----------------- Reports -----------------
+# Read from the incrementally maintained rollup tables (rollups.py), so the
+# cost depends on the number of roles and days, not on resume_results.
+@metrics.timed("report")
+def get_report(company=None, days=90):
+    db = get_db()
+    since = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    return {
+        "role_scores": rollups.role_scores(db, company),
+        "missing_skills": rollups.missing_skills(db, company),
+        "volume": rollups.daily_volume(db, since),
+    }
+
+# ----------------- Startup cost -----------------
+metrics.IMPORT_SECONDS.set(time.perf_counter() - _import_started, module="backend")
@@ -0,0 +1,221 @@
+# batch.py
+#
+# Bulk resume analysis from the command line, e.g.
+#   python batch.py "drive/*.pdf" --company TCS --designation "Software Developer" --out results.jsonl
+#
+# Files are analyzed in a process pool with a bounded number in flight, each
+# result is streamed to the output file as soon as it finishes, and rows are
+# written to the database in batched transactions, deduplicated against
+# earlier submissions like every other save (see fingerprint.py). A file is
+# recorded in the checkpoint once its output line is on disk and its row is
+# committed, so rerunning the same command after an interruption skips
+# everything that was already saved. Failed files are never checkpointed: a
+# rerun retries them. Files whose output line was written but not yet
+# checkpointed are analyzed and saved again (saves are deduplicated) without
+# repeating their output line.
+
+import argparse
+import csv
+import glob
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import backend
+import metrics
+import pdf_extract
+
+CSV_FIELDS = ["file", "name", "status", "score", "relevance", "skills_found", "missing", "ats_format", "error"]
+
+
+# ----------------- Input discovery -----------------
+def find_resumes(source):
+    if os.path.isdir(source):
+        pattern = os.path.join(source, "**", "*.pdf")
+    else:
+        pattern = source
+    return sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+
+
+# ----------------- Checkpoint -----------------
+def load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+# {file: status} of the lines an earlier run already wrote to `path`; a line
+# cut short by a crash is ignored
+def load_written(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            return {row["file"]: row["status"] for row in csv.DictReader(f) if row.get("status")}
+        written = {}
+        for line in f:
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue
+            written[item["file"]] = item["status"]
+        return written
+
+
+# ----------------- Worker -----------------
+def analyze_file(path, company, designation, experience):
+    name = os.path.splitext(os.path.basename(path))[0]
+    try:
+        text = backend.extract_text_from_pdf(path)
+        result = backend.analyze_resume(text, company, designation, experience)
+        # Fingerprinted here so the parent's save only has to look it up
+        fp = backend.fingerprint_text(text)
+    except Exception as e:
+        item = {"file": path, "name": name, "status": "error", "error": f"{type(e).__name__}: {e}"}
+    else:
+        item = {"file": path, "name": name, "status": "ok", "result": result, "fingerprint": fp}
+    # Hand this worker's stage timings back to the parent registry
+    item["metrics"] = metrics.take_snapshot()
+    return item
+
+
+# ----------------- Output writers -----------------
+class ResultWriter:
+    def __init__(self, path, append):
+        self.path = path
+        self.is_csv = path.lower().endswith(".csv")
+        if append and os.path.exists(path):
+            _drop_partial_line(path)
+        write_header = not (append and os.path.exists(path) and os.path.getsize(path))
+        self.file = open(path, "a" if append else "w", encoding="utf-8", newline="")
+        if self.is_csv:
+            self.csv = csv.DictWriter(self.file, fieldnames=CSV_FIELDS)
+            if write_header:
+                self.csv.writeheader()
+
+    def write(self, item):
+        result = item.get("result", {})
+        if self.is_csv:
+            self.csv.writerow({
+                "file": item["file"],
+                "name": item["name"],
+                "status": item["status"],
+                "score": result.get("score", ""),
+                "relevance": result.get("relevance", ""),
+                "skills_found": ", ".join(result.get("skills_found", [])),
+                "missing": ", ".join(result.get("missing", [])),
+                "ats_format": result.get("ats_format", ""),
+                "error": item.get("error", ""),
+            })
+        else:
+            self.file.write(json.dumps(item, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+# Cuts off a line an interrupted run left half-written
+def _drop_partial_line(path):
+    with open(path, "r+b") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+# ----------------- Batch runner -----------------
+def run_batch(paths, company, designation, experience, out_path, checkpoint_path=None,
+              workers=None, db_batch_size=100, save_to_db=True):
+    done = load_checkpoint(checkpoint_path)
+    todo = [path for path in paths if path not in done]
+    # Resuming: append to the earlier output and don't repeat lines it already has
+    written = load_written(out_path) if checkpoint_path and os.path.exists(checkpoint_path) else {}
+    writer = ResultWriter(out_path, append=bool(done or written))
+    checkpoint = open(checkpoint_path, "a", encoding="utf-8") if checkpoint_path else None
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    pending_rows, pending_files = [], []
+    counts = {"ok": 0, "error": 0, "skipped": len(paths) - len(todo)}
+
+    # Output lines are already on disk; rows are committed before their files are checkpointed
+    def flush():
+        if save_to_db and pending_rows:
+            backend.save_results(pending_rows)
+        if checkpoint:
+            checkpoint.writelines(path + "\n" for path in pending_files)
+            checkpoint.flush()
+        pending_rows.clear()
+        pending_files.clear()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=pdf_extract.disable_page_pool) as pool:
+            queue = iter(todo)
+            in_flight = set()
+            while True:
+                for path in queue:
+                    in_flight.add(pool.submit(analyze_file, path, company, designation, experience))
+                    if len(in_flight) >= max_in_flight:
+                        break
+                if not in_flight:
+                    break
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    item = future.result()
+                    metrics.merge_snapshot(item.pop("metrics", {}))
+                    fp = item.pop("fingerprint", None)
+                    if written.get(item["file"]) != item["status"]:
+                        writer.write(item)
+                    counts[item["status"]] += 1
+                    if item["status"] == "ok":
+                        pending_rows.append((item["name"], company, designation, experience, item["result"], fp))
+                        pending_files.append(item["file"])
+                        if len(pending_files) >= db_batch_size:
+                            flush()
+    finally:
+        flush()
+        writer.close()
+        if checkpoint:
+            checkpoint.close()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a directory or glob of resume PDFs against one company/role.")
+    parser.add_argument("source", help="directory of PDFs (searched recursively) or a glob pattern")
+    parser.add_argument("--company", required=True, choices=sorted(backend.COMPANY_REQUIREMENTS))
+    parser.add_argument("--designation", required=True)
+    parser.add_argument("--experience", default="Fresher", choices=["Fresher", "Experienced"])
+    parser.add_argument("--out", default="batch_results.jsonl", help="output file; .csv writes CSV, anything else JSONL")
+    parser.add_argument("--checkpoint", default=None, help="checkpoint file (default: <out>.checkpoint)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--db-batch-size", type=int, default=100)
+    parser.add_argument("--no-db", action="store_true", help="only write the output file")
+    parser.add_argument("--metrics-file", help="write Prometheus text metrics for the run to this file")
+    args = parser.parse_args(argv)
+
+    if args.designation not in backend.COMPANY_REQUIREMENTS[args.company]:
+        parser.error(f"unknown designation {args.designation!r} for {args.company}")
+
+    paths = find_resumes(args.source)
+    if not paths:
+        parser.error(f"no PDF files match {args.source!r}")
+
+    counts = run_batch(
+        paths, args.company, args.designation, args.experience, args.out,
+        checkpoint_path=args.checkpoint or args.out + ".checkpoint",
+        workers=args.workers,
+        db_batch_size=args.db_batch_size,
+        save_to_db=not args.no_db,
+    )
+    if args.metrics_file:
+        metrics.write_textfile(args.metrics_file)
+    print(f"ok={counts['ok']} errors={counts['error']} skipped={counts['skipped']} -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+# benchmarks/corpus.py
+#
+# Deterministic synthetic resume corpus. Everything is derived from a seed, so
+# two runs (or two machines) benchmark byte-identical PDFs. The PDFs are
+# written by hand (plain Helvetica text objects), so no extra dependency is
+# needed to build the corpus offline.
+
+import os
+import random
+
+PAGE_COUNTS = [1, 1, 2, 2, 3, 5, 10, 20]
+SKILL_DENSITIES = [0.0, 0.25, 0.5, 0.75, 1.0]
+LINES_PER_PAGE = 48
+CHARS_PER_LINE = 90
+
+FILLER = (
+    "delivered improved designed collaborated team stakeholders release quality customers "
+    "reduced latency migrated automated reporting weekly dashboards mentored interns "
+    "owned roadmap sprint reviews cross functional documentation onboarding"
+).split()
+
+SECTION_HEADINGS = {
+    "summary": ["Summary", "Objective", "Professional Summary", "Career Objective"],
+    "experience": ["Experience", "Work Experience", "Professional Experience"],
+    "projects": ["Projects", "Academic Projects", "Personal Projects", "Project Experience"],
+    "education": ["Education", "Academic Background"],
+    "skills": ["Skills", "Technical Skills"],
+}
+
+
+# ----------------- Resume text -----------------
+def _sentence(rng, skills):
+    words = rng.sample(FILLER, 8)
+    for skill in skills:
+        words.insert(rng.randrange(len(words) + 1), skill)
+    return " ".join(words).capitalize() + "."
+
+
+def generate_resume(rng, index, requirements):
+    company = rng.choice(sorted(requirements))
+    designation = rng.choice(sorted(requirements[company]))
+    role_skills = requirements[company][designation]
+    density = SKILL_DENSITIES[index % len(SKILL_DENSITIES)]
+    pages = PAGE_COUNTS[index % len(PAGE_COUNTS)]
+    known = rng.sample(role_skills, round(len(role_skills) * density))
+
+    sections = list(SECTION_HEADINGS)
+    rng.shuffle(sections)
+    # A share of resumes leave out sections so the ATS checks see both outcomes
+    if index % 4 == 3:
+        sections.remove(rng.choice(sections))
+
+    target_lines = pages * LINES_PER_PAGE
+    lines = [f"Candidate {index:05d}", f"candidate{index:05d}@example.com", ""]
+    per_section = max(2, (target_lines - len(lines)) // len(sections) - 2)
+    for section in sections:
+        lines.append(rng.choice(SECTION_HEADINGS[section]))
+        body = []
+        while len(body) < per_section:
+            mentioned = [skill for skill in known if rng.random() < 0.15]
+            if section == "skills":
+                mentioned = known
+            body.extend(_wrap(_sentence(rng, mentioned)))
+        lines.extend(body[:per_section])
+        lines.append("")
+    return {
+        "company": company,
+        "designation": designation,
+        "pages": pages,
+        "density": density,
+        "lines": lines,
+    }
+
+
+def _wrap(text):
+    lines, current = [], ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > CHARS_PER_LINE:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}".strip()
+    if current:
+        lines.append(current)
+    return lines
+
+
+# ----------------- Minimal PDF writer -----------------
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(lines):
+    return build_pdf_pages([lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]])
+
+
+# One page per list of lines; the tests use this directly for exact page layouts
+def build_pdf_pages(pages):
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page_lines in pages:
+        stream = "BT /F1 10 Tf 14 TL 40 760 Td " + " ".join(f"({_escape(line)}) '" for line in page_lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+
+# ----------------- Corpus -----------------
+def generate_corpus(requirements, count, seed=42):
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(count):
+        resume = generate_resume(rng, index, requirements)
+        resume["pdf"] = build_pdf(resume["lines"])
+        corpus.append(resume)
+    return corpus
+
+
+def write_corpus(directory, requirements, count, seed=42):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index, resume in enumerate(generate_corpus(requirements, count, seed)):
+        path = os.path.join(directory, f"resume_{index:05d}_{resume['pages']}p.pdf")
+        with open(path, "wb") as f:
+            f.write(resume["pdf"])
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from backend import COMPANY_REQUIREMENTS
+
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic resume PDF corpus.")
+    parser.add_argument("directory")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    paths = write_corpus(args.directory, COMPANY_REQUIREMENTS, args.count, args.seed)
+    print(f"wrote {len(paths)} PDFs to {args.directory}")
@@ -0,0 +1,97 @@
+# benchmarks/import_time.py
+#
+# Reports what a cold process pays before it can serve a request:
+#   python benchmarks/import_time.py [--out import_time.json]
+#
+# 1. `python -X importtime -c "import <module>"` for backend and app-facing
+#    modules: total import time and the slowest imported modules.
+# 2. First-use cost of each lazily created resource (skill matcher, role
+#    index, database, PDF cache, pdfplumber on the first PDF).
+# Each measurement runs in a fresh interpreter inside a temporary directory.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_USE = {
+    "get_skill_matcher": "backend.get_skill_matcher()",
+    "get_role_index": "backend.get_role_index()",
+    "get_db": "backend.get_db()",
+    "get_pdf_cache": "backend.get_pdf_cache()",
+    "first_pdf (pdfplumber import + parse)": "backend.parse_pdf_text(PDF)",
+}
+
+FIRST_USE_SCRIPT = '''
+import sys, time
+sys.path[:0] = [{repo!r}, {bench!r}]
+import backend
+from corpus import build_pdf
+PDF = build_pdf(["Summary", "java developer"])
+started = time.perf_counter()
+{call}
+print(time.perf_counter() - started)
+'''
+
+
+def _python(args, cwd):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, PYTHONDONTWRITEBYTECODE="1")
+    return subprocess.run([sys.executable, *args], cwd=cwd, env=env, capture_output=True, text=True, check=True)
+
+
+def import_profile(module, cwd, top=10):
+    stderr = _python(["-X", "importtime", "-c", f"import {module}"], cwd).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    total = next((cumulative for cumulative, _, name in rows if name == module), 0)
+    slowest = sorted(rows, reverse=True)[:top]
+    return {
+        "total_ms": round(total / 1000, 2),
+        "slowest": [{"module": name, "cumulative_ms": round(c / 1000, 2), "self_ms": round(s / 1000, 2)}
+                    for c, s, name in slowest],
+        "pdfplumber_loaded": any(name.strip() == "pdfplumber" for _, _, name in rows),
+    }
+
+
+def first_use_costs(cwd):
+    costs = {}
+    for label, call in FIRST_USE.items():
+        script = FIRST_USE_SCRIPT.format(repo=REPO_ROOT, bench=os.path.dirname(os.path.abspath(__file__)), call=call)
+        costs[label] = round(float(_python(["-c", script], cwd).stdout.strip().splitlines()[-1]) * 1000, 2)
+    return costs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import and first-use costs.")
+    parser.add_argument("--out", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="resume-import-") as cwd:
+        report = {
+            "imports": {module: import_profile(module, cwd) for module in ("backend", "api_server", "batch")},
+            "first_use_ms": first_use_costs(cwd),
+        }
+
+    for module, profile in report["imports"].items():
+        print(f"import {module}: {profile['total_ms']} ms (pdfplumber loaded: {profile['pdfplumber_loaded']})")
+        for row in profile["slowest"][:5]:
+            print(f"    {row['cumulative_ms']:>9.2f} ms  {row['module']}")
+    print("first use:")
+    for label, ms in report["first_use_ms"].items():
+        print(f"    {ms:>9.2f} ms  {label}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+# benchmarks/run.py
+#
+# Stage-by-stage benchmark of the analyzer pipeline against a synthetic corpus:
+#   python benchmarks/run.py --out bench.json
+#   python benchmarks/run.py --out new.json --baseline bench.json   # compare
+#
+# Everything runs inside a temporary directory, so the resume database and
+# PDF cache used here never touch the real ones. Results are JSON: one entry
+# per stage with p50/p95 latency, throughput and peak traced memory. With
+# --baseline, stages whose p95 got slower than --max-regression are listed
+# and the exit code is 1.
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+TRACED_SAMPLE = 5
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+# ----------------- Measurement helpers -----------------
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+# Stages share backend's per-text segmentation cache; it is cleared before
+# every item so a corpus of 32 or fewer resumes doesn't time cache hits
+def _reset_caches():
+    import backend
+    backend._segment.cache_clear()
+
+
+# traced_fn, if given, replaces fn for the memory pass: tracemalloc only sees
+# this process, so work that normally runs in a child process has to be
+# repeated in-process to be measured at all
+def measure(name, fn, items, repeat=1, traced_fn=None):
+    # Timing pass (no tracing overhead), then a separate traced pass for peak memory
+    latencies = []
+    gc.collect()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            _reset_caches()
+            t0 = time.perf_counter()
+            fn(item)
+            latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    for item in items[:TRACED_SAMPLE]:
+        _reset_caches()
+        (traced_fn or fn)(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return name, {
+        "n": len(latencies),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 4),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 4),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 4) if latencies else 0.0,
+        "throughput_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "peak_traced_kb": round(peak / 1024, 1),
+    }
+
+
+def measure_concurrent(name, fn, threads, per_thread):
+    latencies = []
+    lock = threading.Lock()
+
+    def worker():
+        local = []
+        for i in range(per_thread):
+            t0 = time.perf_counter()
+            fn(i)
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return name, {
+        "n": len(latencies),
+        "threads": threads,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 4),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 4),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 4),
+        "throughput_per_s": round(len(latencies) / elapsed, 2),
+    }
+
+
+# ----------------- Scenarios -----------------
+def run(args):
+    import backend
+    from corpus import generate_corpus
+
+    corpus = generate_corpus(backend.COMPANY_REQUIREMENTS, args.corpus_size, args.seed)
+    pdfs = [resume["pdf"] for resume in corpus]
+    results = {}
+
+    def record(entry):
+        name, stats = entry
+        results[name] = stats
+        print(f"{name:<28} p50={stats['p50_ms']:>10.3f}ms  p95={stats['p95_ms']:>10.3f}ms  "
+              f"{stats['throughput_per_s']:>10.1f}/s")
+
+    # pdfplumber parses in pdf_extract's worker processes; the memory pass
+    # parses in-process (page_timeout=None) so its peak is traced
+    from pdf_extract import extract_text
+    record(measure("extract_text_from_pdf.cold", backend.parse_pdf_text, pdfs,
+                   traced_fn=lambda data: extract_text(data, page_timeout=None)))
+    for data in pdfs:
+        backend.extract_text_from_pdf(data)
+    record(measure("extract_text_from_pdf.cached", backend.extract_text_from_pdf, pdfs, repeat=3))
+
+    texts = [backend.parse_pdf_text(data) for data in pdfs]
+    jobs = [(text, resume["company"], resume["designation"]) for text, resume in zip(texts, corpus)]
+    record(measure("analyze_resume", lambda job: backend.analyze_resume(job[0], job[1], job[2], "Fresher"),
+                   jobs, repeat=args.repeat))
+    # Per-rule cost and hit rate of the analyze_resume runs above (see rules.py)
+    import metrics
+    results["rules"] = {}
+    for (rule,), (_, seconds, count) in sorted(metrics.RULE_SECONDS.values.items()):
+        results["rules"][rule] = {"n": count, "mean_us": round(seconds / count * 1e6, 2),
+                                  "matches": metrics.RULE_MATCHES.value(rule=rule)}
+        print(f"  rule {rule:<22} mean={seconds / count * 1e6:>8.2f}us  fired {metrics.RULE_MATCHES.value(rule=rule)}/{count}")
+    record(measure("analyze_projects",
+                   lambda job: backend.analyze_projects(job[0], backend.COMPANY_REQUIREMENTS[job[1]][job[2]]),
+                   jobs, repeat=args.repeat))
+    record(measure("score_all_roles", backend.score_all_roles, texts, repeat=args.repeat))
+    company, designation = jobs[0][1], jobs[0][2]
+    record(measure("score_relevance.batch", lambda batch: backend.score_relevance(batch, company, designation),
+                   [texts], repeat=args.repeat))
+
+    analyses = [backend.analyze_resume(text, company, designation, "Fresher") for text, company, designation in jobs]
+    records = [(f"bench{i}", job[1], job[2], "Fresher", analysis, backend.fingerprint_text(job[0]))
+               for i, (job, analysis) in enumerate(zip(jobs, analyses))]
+    record(measure("save_result", lambda rec: backend.save_fingerprinted(*rec), records))
+    # A fresh candidate name per call, so every save is a real insert and not
+    # a resubmission of a row the stage above already stored
+    names = itertools.count()
+    record(measure_concurrent(
+        "save_result.concurrent",
+        lambda i: backend.save_fingerprinted(f"concurrent{next(names)}", *records[i % len(records)][1:]),
+        threads=args.threads, per_thread=args.inserts_per_thread,
+    ))
+
+    # Grow the table to --history-rows before timing history reads
+    existing = backend.get_db().query("SELECT COUNT(*) FROM resume_results")[0][0]
+    missing = max(0, args.history_rows - existing)
+    for start in range(0, missing, 5000):
+        chunk = min(5000, missing - start)
+        backend.insert_results([records[(start + i) % len(records)][:5] for i in range(chunk)])
+    results["history_rows"] = {"rows": backend.get_db().query("SELECT COUNT(*) FROM resume_results")[0][0]}
+
+    record(measure("get_history", lambda _: backend.get_history(), [None], repeat=3))
+    record(measure("get_history_page", lambda _: backend.get_history_page(limit=50), [None], repeat=20))
+    record(measure("get_history_page.filtered",
+                   lambda _: backend.get_history_page(company=company, designation=designation, min_score=50, limit=50),
+                   [None], repeat=20))
+    return results
+
+
+# A stage regresses when its p95 is both relatively and absolutely slower, so
+# sub-millisecond noise on fast stages doesn't fail the comparison.
+def compare(current, baseline, max_regression, min_delta_ms):
+    regressions = []
+    for name, stats in current["stages"].items():
+        old = baseline.get("stages", {}).get(name)
+        if not old or "p95_ms" not in stats or not old.get("p95_ms"):
+            continue
+        change = (stats["p95_ms"] - old["p95_ms"]) / old["p95_ms"]
+        delta = stats["p95_ms"] - old["p95_ms"]
+        marker = "  <-- regression" if change > max_regression and delta > min_delta_ms else ""
+        print(f"{name:<28} p95 {old['p95_ms']:>10.3f} -> {stats['p95_ms']:>10.3f} ms ({change:+.1%}){marker}")
+        if marker:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume analyzer pipeline.")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.20, help="allowed p95 slowdown (0.20 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="ignore p95 slowdowns smaller than this")
+    parser.add_argument("--corpus-size", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--inserts-per-thread", type=int, default=50)
+    parser.add_argument("--history-rows", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    out_path = os.path.abspath(args.out)
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    workdir = tempfile.mkdtemp(prefix="resume-bench-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        stages = run(args)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "args": vars(args),
+        },
+        "stages": stages,
+    }
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {out_path}")
+
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.max_regression, args.min_delta_ms)
+        if regressions:
+            print(f"{len(regressions)} stage(s) regressed: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
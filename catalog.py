@@ -0,0 +1,268 @@
+# catalog.py
+#
+# The company/role skill catalog lives in skill_catalog.json, a versioned data
+# file recruiters can edit without a deploy. load() validates it, dedupes and
+# interns the skill names, and compiles what the hot path needs (the skill
+# vocabulary, the role bitset index, the compiled regex matcher, the analysis
+# rule set and the relevance model) into one Catalog object.
+# Compiled catalogs are pickled under COMPILED_DIR keyed by the file's
+# sha256, so a process start, or a reload to a version this machine has seen
+# before, skips the matcher and index build.
+#
+# Besides "companies", the file may hold "rules" (company-specific checks,
+# see rules.py) and "aliases", other spellings of a skill
+# ({"kubernetes": ["k8s"]}) that the relevance score counts as that skill.
+#
+# current() hot-reloads: at most every RELOAD_CHECK_SECONDS it stats the file
+# and, when mtime/size changed, loads the new version and swaps it in. A file
+# that fails validation is logged and the previous catalog stays live.
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+from collections.abc import Mapping
+
+import metrics
+import rules
+from relevance import RelevanceModel
+from role_index import RoleIndex
+from skill_matcher import SkillMatcher
+
+CATALOG_PATH = os.environ.get(
+    "RESUME_SKILL_CATALOG", os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_catalog.json")
+)
+COMPILED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".catalog_cache")
+SCHEMA_VERSION = 1
+# Bump when Catalog, SkillMatcher, RoleIndex, RuleSet or RelevanceModel change shape, so stale pickles are ignored
+COMPILED_FORMAT = 7
+RELOAD_CHECK_SECONDS = 2.0
+
+log = logging.getLogger(__name__)
+
+
+class CatalogError(ValueError):
+    pass
+
+
+# ----------------- Validation -----------------
+# json.load silently keeps the last of two equal keys; that is how a second
+# "IBM" block used to shadow the first, so duplicates are rejected outright.
+def _reject_duplicate_keys(pairs):
+    seen = {}
+    for key, value in pairs:
+        if key in seen:
+            raise CatalogError(f"duplicate key {key!r}")
+        seen[key] = value
+    return seen
+
+
+def _normalize(skill):
+    return sys.intern(" ".join(skill.lower().split()))
+
+
+def parse(raw):
+    try:
+        data = json.loads(raw, object_pairs_hook=_reject_duplicate_keys)
+    except json.JSONDecodeError as exc:
+        raise CatalogError(f"invalid JSON: {exc}") from exc
+    if not isinstance(data, dict) or data.get("schema_version") != SCHEMA_VERSION:
+        raise CatalogError(f"expected an object with schema_version {SCHEMA_VERSION}")
+    version = data.get("catalog_version")
+    if not isinstance(version, str) or not version:
+        raise CatalogError("catalog_version must be a non-empty string")
+    companies = data.get("companies")
+    if not isinstance(companies, dict) or not companies:
+        raise CatalogError("companies must be a non-empty object")
+
+    requirements = {}
+    for company, roles in companies.items():
+        if not company.strip() or not isinstance(roles, dict) or not roles:
+            raise CatalogError(f"{company!r}: expected a non-empty object of roles")
+        requirements[sys.intern(company)] = compiled_roles = {}
+        for designation, skills in roles.items():
+            where = f"{company} / {designation}"
+            if not designation.strip() or not isinstance(skills, list) or not skills:
+                raise CatalogError(f"{where}: expected a non-empty list of skills")
+            if not all(isinstance(skill, str) and skill.strip() for skill in skills):
+                raise CatalogError(f"{where}: skills must be non-empty strings")
+            # Order-preserving dedupe after normalization ("SQL" and "sql " are one skill)
+            compiled_roles[sys.intern(designation)] = tuple(dict.fromkeys(_normalize(skill) for skill in skills))
+
+    aliases = _parse_aliases(data.get("aliases", {}), requirements)
+
+    # Optional company-specific analysis rules, added to rules.DEFAULT_RULES
+    rule_specs = data.get("rules", [])
+    if not isinstance(rule_specs, list):
+        raise CatalogError("rules must be a list")
+    try:
+        rule_set = rules.compile_rules(rule_specs, requirements)
+    except rules.RuleError as exc:
+        raise CatalogError(f"rules: {exc}") from exc
+    return version, requirements, rule_set, aliases
+
+
+# {"excel": ["ms excel", "microsoft excel"]} -> {"ms excel": "excel", "microsoft excel": "excel"}.
+# An alias may itself be a catalog skill ("ms excel"); chains are rejected.
+def _parse_aliases(groups, requirements):
+    if not isinstance(groups, dict):
+        raise CatalogError("aliases must be an object of skill -> list of aliases")
+    vocabulary = {skill for roles in requirements.values() for skills in roles.values() for skill in skills}
+    canonical = {_normalize(skill) for skill in groups}
+    aliases = {}
+    for skill, forms in groups.items():
+        target = _normalize(skill)
+        if target not in vocabulary:
+            raise CatalogError(f"aliases: {skill!r} is not a skill of any role")
+        if not isinstance(forms, list) or not forms or not all(isinstance(form, str) and form.strip() for form in forms):
+            raise CatalogError(f"aliases: {skill!r} needs a non-empty list of strings")
+        for form in map(_normalize, forms):
+            if form == target or form in canonical:
+                raise CatalogError(f"aliases: {form!r} cannot be an alias of {skill!r}")
+            if aliases.setdefault(form, target) != target:
+                raise CatalogError(f"aliases: {form!r} is listed under both {aliases[form]!r} and {skill!r}")
+    return aliases
+
+
+# ----------------- Compiled form -----------------
+class Catalog:
+    def __init__(self, version, digest, requirements, rule_set=None, aliases=None):
+        self.version = version
+        self.digest = digest
+        self.requirements = requirements
+        self.skills = tuple(sorted({skill for roles in requirements.values() for skills in roles.values() for skill in skills}))
+        self.roles = [(company, designation) for company, roles in requirements.items() for designation in roles]
+        self.aliases = aliases or {}
+        # Spellings that are not skills themselves: matched for mention counts only
+        vocabulary = frozenset(self.skills)
+        self.alias_forms = frozenset(form for form in self.aliases if form not in vocabulary)
+        self.matcher = SkillMatcher(self.skills + tuple(sorted(self.alias_forms)))
+        self.role_index = RoleIndex(requirements)
+        self.rules = rule_set if rule_set is not None else rules.compile_rules(companies=requirements)
+        self.relevance = RelevanceModel(requirements, self.aliases)
+
+
+def _compiled_path(digest):
+    return os.path.join(COMPILED_DIR, f"{digest}-v{COMPILED_FORMAT}.pickle")
+
+
+def _read_compiled(digest):
+    try:
+        with open(_compiled_path(digest), "rb") as f:
+            compiled = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        log.warning("ignoring unreadable compiled catalog %s: %s", _compiled_path(digest), exc)
+        return None
+    return compiled if isinstance(compiled, Catalog) and compiled.digest == digest else None
+
+
+def _write_compiled(compiled):
+    path = _compiled_path(compiled.digest)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(COMPILED_DIR, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as exc:
+        # Read-only checkouts still work, they just compile on every start
+        log.warning("could not cache compiled catalog: %s", exc)
+
+
+def load(path=CATALOG_PATH):
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    compiled = _read_compiled(digest)
+    if compiled is not None:
+        metrics.CATALOG_LOADS.inc(source="compiled_cache")
+        return compiled
+    try:
+        version, requirements, rule_set, aliases = parse(raw.decode("utf-8"))
+    except (CatalogError, UnicodeDecodeError) as exc:
+        metrics.CATALOG_LOADS.inc(source="invalid")
+        raise CatalogError(f"{path}: {exc}") from exc
+    compiled = Catalog(version, digest, requirements, rule_set, aliases)
+    _write_compiled(compiled)
+    metrics.CATALOG_LOADS.inc(source="compiled")
+    return compiled
+
+
+# ----------------- Hot reload -----------------
+_current = None
+_signature = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def current():
+    global _current, _signature, _checked_at
+    if _current is not None and time.monotonic() - _checked_at < RELOAD_CHECK_SECONDS:
+        return _current
+    with _lock:
+        if _current is not None and time.monotonic() - _checked_at < RELOAD_CHECK_SECONDS:
+            return _current
+        _checked_at = time.monotonic()
+        try:
+            stat = os.stat(CATALOG_PATH)
+        except OSError:
+            if _current is None:
+                raise
+            log.warning("skill catalog %s is missing; keeping version %s", CATALOG_PATH, _current.version)
+            return _current
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != _signature:
+            try:
+                loaded = load(CATALOG_PATH)
+            except (CatalogError, OSError) as exc:
+                if _current is None:
+                    raise
+                log.warning("not reloading skill catalog: %s; keeping version %s", exc, _current.version)
+            else:
+                if _current is None or loaded.digest != _current.digest:
+                    _current = loaded
+            # A bad edit is retried only once the file changes again
+            _signature = signature
+        return _current
+
+
+# Read-only dict view that always resolves against the live catalog, for
+# callers that just need company -> designation -> skills lookups.
+class RequirementsView(Mapping):
+    def __getitem__(self, company):
+        return current().requirements[company]
+
+    def __iter__(self):
+        return iter(current().requirements)
+
+    def __len__(self):
+        return len(current().requirements)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate and precompile the skill catalog.")
+    parser.add_argument("path", nargs="?", default=CATALOG_PATH)
+    args = parser.parse_args(argv)
+    try:
+        compiled = load(args.path)
+    except CatalogError as exc:
+        print(f"invalid catalog: {exc}")
+        return 1
+    print(f"catalog {compiled.version} ({compiled.digest[:12]}): {len(compiled.requirements)} companies, "
+          f"{len(compiled.roles)} roles, {len(compiled.skills)} skills, {len(compiled.aliases)} aliases, "
+          f"{len(compiled.rules.rules)} rules")
+    return 0
+
+
+if __name__ == "__main__":
+    # Through the module, so the pickled cache refers to catalog.Catalog, not __main__.Catalog
+    import catalog
+    sys.exit(catalog.main())
@@ -0,0 +1,217 @@
+# fingerprint.py
+#
+# Duplicate detection for resubmitted resumes. Each saved analysis gets two
+# fingerprints of its extracted text: a sha256 of the whitespace-normalized
+# words (exact duplicates) and a 64-bit SimHash over word shingles (near
+# duplicates: an edited line flips a minority of the bits). The SimHash is split
+# into BANDS 4-bit bands stored in `fingerprint_buckets`; two signatures
+# within NEAR_DUP_BITS of each other always share at least one band, so the
+# LSH lookup is a handful of primary-key probes instead of a table scan.
+# Bands are hashed together with the dedupe key, so narrow bands only collide
+# with the same candidate's other submissions. Replacing one line of a one-page
+# resume flips up to ~12 bits (unrelated texts differ by ~32), so the bands
+# have to be this narrow.
+#
+# Everything is scoped per dedupe key (candidate name + company + designation
+# + experience). Near duplicates share a cluster_id, the id of the first
+# result in the group, which the admin history uses to collapse them.
+
+import hashlib
+import json
+from collections import namedtuple
+from datetime import datetime
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS resume_fingerprints (
+        result_id INTEGER PRIMARY KEY,
+        dedupe_key TEXT NOT NULL,
+        cluster_id INTEGER NOT NULL,
+        text_hash TEXT NOT NULL,
+        simhash INTEGER NOT NULL,
+        catalog_digest TEXT NOT NULL,
+        analysis TEXT NOT NULL,
+        submissions INTEGER NOT NULL DEFAULT 1,
+        last_seen TEXT NOT NULL
+    )
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_fingerprints_exact ON resume_fingerprints (dedupe_key, text_hash)",
+    "CREATE INDEX IF NOT EXISTS idx_fingerprints_cluster ON resume_fingerprints (cluster_id, result_id)",
+    '''
+    CREATE TABLE IF NOT EXISTS fingerprint_buckets (
+        bucket INTEGER NOT NULL,
+        result_id INTEGER NOT NULL,
+        PRIMARY KEY (bucket, result_id)
+    ) WITHOUT ROWID
+    ''',
+]
+
+SIMHASH_BITS = 64
+BANDS = 16
+BAND_BITS = SIMHASH_BITS // BANDS
+# Must stay below BANDS so the pigeonhole argument above holds
+NEAR_DUP_BITS = 14
+SHINGLE_WORDS = 3
+# Stored in `meta` once existing rows are bucketed with the current bands
+BUCKET_LAYOUT = f"{BANDS}x{BAND_BITS}"
+LAYOUT_KEY = "fingerprint_bucket_layout"
+REBUCKET_CHUNK = 5000
+
+Fingerprint = namedtuple("Fingerprint", "text_hash simhash")
+
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+# SQLite integers are signed 64-bit
+def _to_signed(value):
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+def dedupe_key(name, company, designation, experience):
+    return "\x1f".join(" ".join(str(part).lower().split()) for part in (name, company, designation, experience))
+
+
+# ----------------- Signatures -----------------
+def fingerprint(text):
+    words = text.lower().split()
+    text_hash = hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest()
+    if len(words) < SHINGLE_WORDS:
+        shingles = [" ".join(words)] if words else []
+    else:
+        shingles = [" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)]
+    return Fingerprint(text_hash, simhash(shingles))
+
+
+def simhash(shingles):
+    if not shingles:
+        return 0
+    # imported here so only fingerprinting pays for numpy
+    import numpy as np
+
+    hashes = np.fromiter((_hash64(shingle) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    bits = (hashes[:, None] >> np.arange(SIMHASH_BITS, dtype=np.uint64)) & np.uint64(1)
+    # Bit i is set when more than half of the shingles have it set
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 > len(shingles)
+    return int(sum(1 << i for i, vote in enumerate(votes) if vote))
+
+
+def buckets(key, signature):
+    mask = (1 << BAND_BITS) - 1
+    return [
+        _to_signed(_hash64(f"{key}\x1f{band}\x1f{(signature >> (band * BAND_BITS)) & mask}"))
+        for band in range(BANDS)
+    ]
+
+
+# ----------------- Lookup -----------------
+# Returns the most recent earlier analysis for the same dedupe key, as
+# {"kind": "exact"|"near", "result_id", "cluster_id", "analysis"}, or None.
+# An exact text match analyzed against an older catalog counts as near, so it
+# is rescored rather than reused.
+def lookup(conn, key, fp, catalog_digest):
+    row = conn.execute(
+        '''
+        SELECT result_id, cluster_id, analysis, catalog_digest FROM resume_fingerprints
+        WHERE dedupe_key = ? AND text_hash = ? ORDER BY result_id DESC LIMIT 1
+        ''',
+        (key, fp.text_hash)
+    ).fetchone()
+    if row is not None:
+        result_id, cluster_id, analysis, digest = row
+        return {"kind": "exact" if digest == catalog_digest else "near", "result_id": result_id,
+                "cluster_id": cluster_id, "analysis": json.loads(analysis)}
+
+    probes = buckets(key, fp.simhash)
+    rows = conn.execute(
+        f'''
+        SELECT DISTINCT f.result_id, f.cluster_id, f.simhash, f.analysis
+        FROM fingerprint_buckets b JOIN resume_fingerprints f ON f.result_id = b.result_id
+        WHERE b.bucket IN ({", ".join("?" * len(probes))}) AND f.dedupe_key = ?
+        ORDER BY f.result_id DESC
+        ''',
+        probes + [key]
+    ).fetchall()
+    for result_id, cluster_id, signature, analysis in rows:
+        if (_to_unsigned(signature) ^ fp.simhash).bit_count() <= NEAR_DUP_BITS:
+            return {"kind": "near", "result_id": result_id, "cluster_id": cluster_id, "analysis": json.loads(analysis)}
+    return None
+
+
+# ----------------- Writes (run on the storage writer thread) -----------------
+def record(conn, result_id, key, fp, catalog_digest, analysis, cluster_id=None):
+    conn.execute(
+        '''
+        INSERT INTO resume_fingerprints
+        (result_id, dedupe_key, cluster_id, text_hash, simhash, catalog_digest, analysis, last_seen)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''',
+        (result_id, key, cluster_id or result_id, fp.text_hash, _to_signed(fp.simhash), catalog_digest,
+         json.dumps(analysis), datetime.now().strftime("%Y-%m-%d %H:%M"))
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO fingerprint_buckets (bucket, result_id) VALUES (?, ?)",
+        [(bucket, result_id) for bucket in buckets(key, fp.simhash)]
+    )
+
+
+def record_resubmission(conn, result_id):
+    conn.execute(
+        "UPDATE resume_fingerprints SET submissions = submissions + 1, last_seen = ? WHERE result_id = ?",
+        (datetime.now().strftime("%Y-%m-%d %H:%M"), result_id)
+    )
+
+
+def remove_results(conn, result_ids):
+    for result_id in result_ids:
+        row = conn.execute(
+            "SELECT dedupe_key, simhash FROM resume_fingerprints WHERE result_id = ?", (result_id,)
+        ).fetchone()
+        if row is None:
+            continue
+        conn.executemany(
+            "DELETE FROM fingerprint_buckets WHERE bucket = ? AND result_id = ?",
+            [(bucket, result_id) for bucket in buckets(row[0], _to_unsigned(row[1]))]
+        )
+        conn.execute("DELETE FROM resume_fingerprints WHERE result_id = ?", (result_id,))
+
+
+# ----------------- Migration: rebucket on a band layout change -----------------
+# Buckets written under another BANDS/BAND_BITS are never probed again, so
+# they are dropped and every stored signature is rebucketed in result_id
+# order. Progress is kept in `meta` as "<layout>:<last result_id>" and the
+# bare layout once done. Rows saved meanwhile already use the new layout;
+# rebucketing them again is a no-op.
+def _rebucket_chunk(conn):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (LAYOUT_KEY,)).fetchone()
+    layout, _, last_id = (row[0] if row else "").partition(":")
+    if layout == BUCKET_LAYOUT and not last_id:
+        return 0
+    if layout != BUCKET_LAYOUT:
+        conn.execute("DELETE FROM fingerprint_buckets")
+        last_id = 0
+    rows = conn.execute(
+        "SELECT result_id, dedupe_key, simhash FROM resume_fingerprints WHERE result_id > ? ORDER BY result_id LIMIT ?",
+        (int(last_id), REBUCKET_CHUNK)
+    ).fetchall()
+    conn.executemany(
+        "INSERT OR IGNORE INTO fingerprint_buckets (bucket, result_id) VALUES (?, ?)",
+        [(bucket, result_id) for result_id, key, signature in rows for bucket in buckets(key, _to_unsigned(signature))]
+    )
+    progress = BUCKET_LAYOUT if len(rows) < REBUCKET_CHUNK else f"{BUCKET_LAYOUT}:{rows[-1][0]}"
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (LAYOUT_KEY, progress))
+    return len(rows)
+
+
+def rebucket(storage):
+    total = 0
+    while True:
+        count = storage.write(_rebucket_chunk)
+        total += count
+        if count < REBUCKET_CHUNK:
+            return total
@@ -0,0 +1,345 @@
+# jobs.py
+#
+# Durable background job queue on the same SQLite database as the results.
+# submit() stores the job (the uploaded PDF goes to SPOOL_DIR) and returns its
+# id at once; worker threads claim jobs, run the handler for the job's kind
+# and store the JSON result for callers to poll with get().
+#
+# Scheduling: a worker claims the queued job with the lowest priority value
+# (PRIORITY_INTERACTIVE before PRIORITY_BULK), oldest first, skipping users
+# that already have PER_USER_LIMIT jobs running. In a process with more than
+# RESERVED_INTERACTIVE workers, the first RESERVED_INTERACTIVE of them only
+# take interactive jobs, so a bulk upload can never occupy every worker.
+# Claims run on the storage writer thread under BEGIN IMMEDIATE, so workers in
+# several processes never claim the same job.
+#
+# Recovery: a claimed job holds a lease that its worker renews while it
+# runs. When a process dies, its leases expire and the jobs are requeued
+# (or failed after MAX_ATTEMPTS) by any live worker. Handler errors are
+# retried with exponential backoff unless they are in `permanent_errors`
+# (bad input such as an oversized PDF).
+#
+# Run dedicated workers next to the UI with `python jobs.py --workers 4`.
+
+import argparse
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+
+import metrics
+
+log = logging.getLogger(__name__)
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        user_key TEXT NOT NULL,
+        priority INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        result TEXT,
+        error TEXT,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        worker TEXT,
+        lease_until REAL,
+        run_after REAL NOT NULL,
+        created_at REAL NOT NULL,
+        started_at REAL,
+        finished_at REAL
+    )
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (status, priority, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs (user_key, status)",
+]
+
+SPOOL_DIR = "job_spool"
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+PER_USER_LIMIT = 2
+RESERVED_INTERACTIVE = 1
+MAX_ATTEMPTS = 3
+LEASE_SECONDS = 60
+POLL_SECONDS = 0.5
+RETRY_BASE_SECONDS = 2
+# Pause after a failed claim or bookkeeping write (e.g. "database is locked")
+ERROR_BACKOFF_SECONDS = 5
+RETENTION_SECONDS = 24 * 3600
+DEFAULT_WORKERS = int(os.environ.get("RESUME_JOB_WORKERS", "2"))
+
+JOB_COLUMNS = ["id", "kind", "user_key", "priority", "status", "payload", "result", "error", "attempts",
+               "created_at", "started_at", "finished_at"]
+
+
+class JobQueue:
+    def __init__(self, storage, handlers, permanent_errors=(), spool_dir=SPOOL_DIR):
+        self.storage = storage
+        self.handlers = handlers
+        self.permanent_errors = tuple(permanent_errors)
+        self.spool_dir = spool_dir
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._running = set()
+        self._running_lock = threading.Lock()
+        self._threads = []
+
+    # ----------------- Producers -----------------
+    def submit(self, kind, payload, data=None, user="", priority=PRIORITY_INTERACTIVE):
+        if kind not in self.handlers:
+            raise ValueError(f"unknown job kind {kind!r}")
+        job_id = uuid.uuid4().hex
+        if data is not None:
+            # Spooled (and fsynced) before the job row exists, so a committed job always has its input
+            os.makedirs(self.spool_dir, exist_ok=True)
+            tmp = os.path.join(self.spool_dir, f".{job_id}.tmp")
+            with open(tmp, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self._spool_path(job_id))
+        now = time.time()
+        self.storage.write(lambda conn: conn.execute(
+            '''
+            INSERT INTO jobs (id, kind, user_key, priority, status, payload, run_after, created_at)
+            VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)
+            ''',
+            (job_id, kind, user, priority, json.dumps(payload), now, now)
+        ))
+        metrics.JOBS.inc(event="submitted")
+        self._wake.set()
+        return job_id
+
+    def get(self, job_id):
+        rows = self.storage.query(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        job = dict(zip(JOB_COLUMNS, rows[0]))
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        if job["status"] == "queued":
+            job["position"] = self.storage.query(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND (priority < ? OR (priority = ? AND created_at < ?))",
+                (job["priority"], job["priority"], job["created_at"])
+            )[0][0]
+        return job
+
+    def _spool_path(self, job_id):
+        return os.path.join(self.spool_dir, f"{job_id}.pdf")
+
+    # ----------------- Claiming (runs on the storage writer thread) -----------------
+    def _claim(self, conn, worker, max_priority):
+        now = time.time()
+        row = conn.execute(
+            '''
+            SELECT j.id, j.kind, j.payload, j.created_at FROM jobs j
+            WHERE j.status = 'queued' AND j.run_after <= ? AND j.priority <= ?
+              AND (SELECT COUNT(*) FROM jobs r WHERE r.user_key = j.user_key AND r.status = 'running') < ?
+            ORDER BY j.priority, j.created_at LIMIT 1
+            ''',
+            (now, max_priority, PER_USER_LIMIT)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            '''
+            UPDATE jobs SET status = 'running', worker = ?, lease_until = ?, attempts = attempts + 1,
+                started_at = ? WHERE id = ?
+            ''',
+            (worker, now + LEASE_SECONDS, now, row[0])
+        )
+        metrics.JOB_WAIT_SECONDS.observe(now - row[3])
+        return row[0], row[1], json.loads(row[2])
+
+    # Requeues jobs whose worker stopped renewing its lease and purges old
+    # finished jobs. Returns (jobs requeued or failed, spool files to delete).
+    def _recover(self, conn):
+        now = time.time()
+        expired = conn.execute(
+            "SELECT id, attempts FROM jobs WHERE status = 'running' AND lease_until < ?", (now,)
+        ).fetchall()
+        finished = []
+        for job_id, attempts in expired:
+            if attempts >= MAX_ATTEMPTS:
+                self._finish(conn, job_id, None, "failed", error="worker stopped responding")
+                finished.append(job_id)
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', worker = NULL, lease_until = NULL, run_after = ? WHERE id = ?",
+                    (now, job_id)
+                )
+            metrics.JOBS.inc(event="recovered")
+        old = conn.execute(
+            "SELECT id FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?", (now - RETENTION_SECONDS,)
+        ).fetchall()
+        conn.executemany("DELETE FROM jobs WHERE id = ?", old)
+        return len(expired), finished + [job_id for (job_id,) in old]
+
+    def _finish(self, conn, job_id, worker, status, result=None, error=None):
+        sql = '''
+            UPDATE jobs SET status = ?, result = ?, error = ?, lease_until = NULL, finished_at = ?
+            WHERE id = ? AND status = 'running'
+        '''
+        params = [status, json.dumps(result) if result is not None else None, error, time.time(), job_id]
+        # A worker whose lease was taken over must not overwrite the new attempt
+        if worker is not None:
+            sql += " AND worker = ?"
+            params.append(worker)
+        return conn.execute(sql, params).rowcount > 0
+
+    def _retry(self, conn, job_id, worker, error):
+        attempts = conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+        if attempts >= MAX_ATTEMPTS:
+            return self._finish(conn, job_id, worker, "failed", error=error)
+        conn.execute(
+            '''
+            UPDATE jobs SET status = 'queued', worker = NULL, lease_until = NULL, error = ?, run_after = ?
+            WHERE id = ? AND worker = ? AND status = 'running'
+            ''',
+            (error, time.time() + RETRY_BASE_SECONDS ** attempts, job_id, worker)
+        )
+        return False
+
+    # Spool files are only deleted after the transaction that finished their job committed
+    def _recover_now(self):
+        requeued, done = self.storage.write(self._recover)
+        for job_id in done:
+            self._remove_spool(job_id)
+        if requeued:
+            self._wake.set()
+
+    def _remove_spool(self, job_id):
+        try:
+            os.remove(self._spool_path(job_id))
+        except FileNotFoundError:
+            pass
+
+    # ----------------- Workers -----------------
+    def start(self, workers=DEFAULT_WORKERS):
+        if self._threads:
+            return self
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        if workers:
+            # Pick up jobs a crashed process left behind without waiting for a heartbeat
+            try:
+                self._recover_now()
+            except Exception:
+                log.warning("Job recovery failed; the heartbeat will retry it", exc_info=True)
+        for i in range(workers):
+            max_priority = PRIORITY_INTERACTIVE if i < RESERVED_INTERACTIVE < workers else PRIORITY_BULK
+            thread = threading.Thread(target=self._work, args=(f"{prefix}:{i}", max_priority),
+                                      name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if workers:
+            thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _heartbeat(self):
+        while not self._stop.wait(LEASE_SECONDS / 3):
+            with self._running_lock:
+                running = list(self._running)
+            lease_until = time.time() + LEASE_SECONDS
+            try:
+                if running:
+                    self.storage.write(lambda conn: conn.executemany(
+                        "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                        [(lease_until, job_id, worker) for job_id, worker in running]
+                    ))
+                self._recover_now()
+            except Exception:
+                # Keep renewing; a missed beat only matters after LEASE_SECONDS
+                log.warning("Job heartbeat failed", exc_info=True)
+
+    def _work(self, worker, max_priority=PRIORITY_BULK):
+        while not self._stop.is_set():
+            try:
+                # Cheap read first, so idle workers don't keep taking the write lock
+                ready = self.storage.query(
+                    "SELECT 1 FROM jobs WHERE status = 'queued' AND run_after <= ? AND priority <= ? LIMIT 1",
+                    (time.time(), max_priority)
+                )
+                claimed = self.storage.write(lambda conn: self._claim(conn, worker, max_priority)) if ready else None
+            except Exception:
+                log.exception("Job worker %s could not claim a job", worker)
+                self._stop.wait(ERROR_BACKOFF_SECONDS)
+                continue
+            if claimed is None:
+                self._wake.wait(POLL_SECONDS)
+                self._wake.clear()
+                continue
+            job_id, kind, payload = claimed
+            with self._running_lock:
+                self._running.add((job_id, worker))
+            try:
+                self._run(job_id, kind, payload, worker)
+            finally:
+                with self._running_lock:
+                    self._running.discard((job_id, worker))
+                # A finished job may unblock the same user's next one
+                self._wake.set()
+
+    def _run(self, job_id, kind, payload, worker):
+        spool = self._spool_path(job_id)
+        try:
+            data = None
+            if os.path.exists(spool):
+                with open(spool, "rb") as f:
+                    data = f.read()
+            with metrics.STAGE_SECONDS.time(stage=f"job_{kind}"):
+                result = self.handlers[kind](payload, data)
+        except self.permanent_errors as e:
+            error = str(e)
+            outcome, save = "failed", lambda conn: self._finish(conn, job_id, worker, "failed", error=error)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            outcome, save = "retried", lambda conn: self._retry(conn, job_id, worker, error)
+        else:
+            outcome, save = "done", lambda conn: self._finish(conn, job_id, worker, "done", result=result)
+        try:
+            finished = self.storage.write(save)
+        except Exception:
+            # The job stays running; once its lease expires, recovery requeues it
+            log.exception("Could not record the outcome of job %s", job_id)
+            self._stop.wait(ERROR_BACKOFF_SECONDS)
+            return
+        # A retry that used up the last attempt fails the job
+        metrics.JOBS.inc(event="failed" if outcome == "retried" and finished else outcome)
+        if finished:
+            self._remove_spool(job_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run background analysis workers.")
+    parser.add_argument("--workers", type=int, default=max(DEFAULT_WORKERS, 1))
+    args = parser.parse_args(argv)
+
+    import backend
+
+    backend.start_job_workers(args.workers)
+    metrics.start_exporter()
+    print(f"{args.workers} job workers running; Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        backend.get_job_queue().stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+# metrics.py
+#
+# Small in-process metrics registry with Prometheus text export, plus an
+# opt-in cProfile hook. There is no client library dependency: histograms,
+# counters and gauges are plain dicts guarded by one lock.
+#
+# Export options (pick any):
+#   - start_exporter() reads RESUME_METRICS_PORT (serves /metrics over HTTP)
+#     and RESUME_METRICS_FILE (rewritten every METRICS_FILE_INTERVAL seconds,
+#     node_exporter textfile-collector style)
+#   - render() returns the exposition text, e.g. for the API server's /metrics
+#
+# Worker processes (batch CLI, API pool) keep their own registry; they hand
+# their observations back with take_snapshot() and the parent merges them.
+
+import cProfile
+import functools
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 40)
+SIZE_BUCKETS = (500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+RULE_BUCKETS = (0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005)
+METRICS_FILE_INTERVAL = 15
+PROFILE_DIR = "profiles"
+
+_profile_seq = itertools.count(1)
+
+_lock = threading.RLock()
+_metrics = {}
+
+
+def _label_key(labelnames, labels):
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _format_labels(labelnames, key, extra=()):
+    pairs = list(zip(labelnames, key)) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join(f'{name}="{str(value)}"'.replace("\n", " ") for name, value in pairs)
+    return "{" + body + "}"
+
+
+# ----------------- Metric types -----------------
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self.values = {}
+        _metrics[name] = self
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with _lock:
+            return self.values.get(_label_key(self.labelnames, labels), 0)
+
+    def _render(self):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in self.values.items()]
+
+    def _merge(self, state):
+        for key, value in state.items():
+            self.values[key] = self.values.get(key, 0) + value
+
+
+class Gauge:
+    kind = "gauge"
+
+    # fn, if given, is called at render time instead of storing set() values
+    def __init__(self, name, help_text, labelnames=(), fn=None):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self.values = {}
+        self.fn = fn
+        _metrics[name] = self
+
+    def set(self, value, **labels):
+        with _lock:
+            self.values[_label_key(self.labelnames, labels)] = value
+
+    def _render(self):
+        if self.fn is not None:
+            return [f"{self.name} {self.fn()}"]
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in self.values.items()]
+
+    def _merge(self, state):
+        self.values.update(state)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.values = {}
+        _metrics[name] = self
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        with _lock:
+            series = self.values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _render(self):
+        lines = []
+        for key, (counts, total, count) in self.values.items():
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', bound)])} {bucket_count}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', '+Inf')])} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+    def _merge(self, state):
+        for key, (counts, total, count) in state.items():
+            series = self.values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            series[0] = [a + b for a, b in zip(series[0], counts)]
+            series[1] += total
+            series[2] += count
+
+
+# ----------------- Hot-path metrics -----------------
+STAGE_SECONDS = Histogram("resume_stage_seconds", "Latency of each pipeline stage.", ["stage"])
+PDF_PAGES = Histogram("resume_pdf_pages", "Pages per parsed PDF.", buckets=PAGE_BUCKETS)
+TEXT_CHARS = Histogram("resume_text_chars", "Characters of extracted resume text.", buckets=SIZE_BUCKETS)
+PDF_CACHE_LOOKUPS = Counter("resume_pdf_cache_lookups_total", "Extracted-text cache lookups by outcome.", ["outcome"])
+DB_LOCK_WAIT_SECONDS = Histogram("resume_db_lock_wait_seconds", "Time the writer waited for the SQLite write lock.")
+DB_QUEUE_WAIT_SECONDS = Histogram("resume_db_write_queue_seconds", "Time a write waited in the group-commit queue.")
+IMPORT_SECONDS = Gauge("resume_import_seconds", "Wall time spent importing a module at startup.", ["module"])
+CATALOG_LOADS = Counter("resume_catalog_loads_total", "Skill catalog loads by source (compiled, compiled_cache, invalid).",
+                        ["source"])
+DEDUPE_OUTCOMES = Counter("resume_dedupe_total", "Fingerprinted saves by outcome (new, exact, near, near_changed).", ["outcome"])
+JOBS = Counter("resume_jobs_total", "Background job events (submitted, done, retried, failed, recovered).", ["event"])
+JOB_WAIT_SECONDS = Histogram("resume_job_wait_seconds", "Time a background job waited in the queue before a worker claimed it.")
+RULE_SECONDS = Histogram("resume_rule_seconds", "Latency of each analysis rule.", ["rule"], buckets=RULE_BUCKETS)
+RULE_MATCHES = Counter("resume_rule_matches_total", "Analyses in which each rule fired (produced a warning).", ["rule"])
+DB_GROUP_SIZE = Histogram("resume_db_group_commit_size", "Writes per group commit.", buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+
+
+def _cache_hit_ratio():
+    hits = PDF_CACHE_LOOKUPS.value(outcome="memory") + PDF_CACHE_LOOKUPS.value(outcome="disk")
+    lookups = hits + PDF_CACHE_LOOKUPS.value(outcome="miss")
+    return round(hits / lookups, 4) if lookups else 0.0
+
+
+PDF_CACHE_HIT_RATIO = Gauge("resume_pdf_cache_hit_ratio", "Share of PDF lookups served from the text cache.",
+                            fn=_cache_hit_ratio)
+
+
+def timed(stage):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with STAGE_SECONDS.time(stage=stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ----------------- Export -----------------
+def render():
+    with _lock:
+        lines = []
+        for metric in _metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric._render())
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+def take_snapshot():
+    with _lock:
+        snapshot = {}
+        for name, metric in _metrics.items():
+            if getattr(metric, "fn", None) is None and metric.values:
+                snapshot[name] = metric.values
+                metric.values = {}
+    return snapshot
+
+
+def merge_snapshot(snapshot):
+    with _lock:
+        for name, state in snapshot.items():
+            if name in _metrics:
+                _metrics[name]._merge(state)
+
+
+_exporter_started = False
+
+
+def start_exporter(port=None, path=None):
+    global _exporter_started
+    port = port or os.environ.get("RESUME_METRICS_PORT")
+    path = path or os.environ.get("RESUME_METRICS_FILE")
+    with _lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+    if port:
+        # http.server is only imported when an HTTP exporter is actually requested
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", int(port)), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    if path:
+        def loop():
+            while True:
+                write_textfile(path)
+                time.sleep(METRICS_FILE_INTERVAL)
+        threading.Thread(target=loop, name="metrics-file", daemon=True).start()
+
+
+# ----------------- Per-request profiling -----------------
+# Wrap one request in `with profiled("analyze", enabled=...) as profile:`;
+# when enabled, cProfile stats are dumped to PROFILE_DIR and profile["path"]
+# holds the file name (open it with `python -m pstats` or snakeviz).
+@contextmanager
+def profiled(label, enabled=True):
+    info = {"path": None}
+    if not enabled:
+        yield info
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield info
+    finally:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        info["path"] = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_profile_seq)}-{label}.prof")
+        profiler.dump_stats(info["path"])
@@ -0,0 +1,204 @@
+# pdf_cache.py
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+
+CACHE_DB_PATH = "pdf_cache.db"
+MEMORY_LIMIT_BYTES = 32 * 1024 * 1024
+DISK_LIMIT_BYTES = 256 * 1024 * 1024
+BUSY_TIMEOUT_MS = 5000
+TOUCH_BATCH = 64
+TOUCH_INTERVAL_SECONDS = 30.0
+TRIM_CHUNK = 64
+
+log = logging.getLogger(__name__)
+
+
+# ----------------- Cache key -----------------
+def content_key(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# ----------------- Two-tier extracted-text cache -----------------
+# Tier 1 is an in-process LRU bounded by total text size; tier 2 is a SQLite
+# file that survives restarts and is trimmed least-recently-used first once
+# it grows past its byte budget. Both tiers are keyed by the hash of the
+# uploaded PDF bytes, so resubmitting the same file skips PDF parsing.
+# The disk tier is only an optimization: several processes share the file
+# (WAL mode, busy timeout), and a SQLite error there is logged and treated
+# as a miss instead of failing the extraction.
+# Disk hits don't write: their last_used times are buffered and flushed in
+# one statement every TOUCH_BATCH hits or TOUCH_INTERVAL_SECONDS, and before
+# any trim. The disk byte total is kept as a running sum per process; it is
+# recounted from the table only when it says the budget is exceeded, since
+# other processes may have inserted or trimmed in the meantime.
+class TextCache:
+    def __init__(self, path=CACHE_DB_PATH, memory_limit=MEMORY_LIMIT_BYTES, disk_limit=DISK_LIMIT_BYTES):
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.evictions = 0
+        self._touched = {}
+        self._touched_at = time.monotonic()
+        self._disk_bytes = 0
+
+        try:
+            self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+            self._conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS pdf_text (
+                    key TEXT PRIMARY KEY,
+                    text TEXT,
+                    size INTEGER,
+                    last_used REAL
+                )
+            ''')
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pdf_text_last_used ON pdf_text (last_used)")
+            self._conn.commit()
+            self._disk_bytes = self._count_disk_bytes()
+        except sqlite3.Error as exc:
+            log.warning("PDF text cache %s unavailable, using memory only: %s", path, exc)
+            self._conn = None
+
+    def get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                metrics.PDF_CACHE_LOOKUPS.inc(outcome="memory")
+                return entry[0]
+
+            row = self._disk_get(key)
+            if row is None:
+                self.misses += 1
+                metrics.PDF_CACHE_LOOKUPS.inc(outcome="miss")
+                return None
+            self.hits_disk += 1
+            metrics.PDF_CACHE_LOOKUPS.inc(outcome="disk")
+            self._remember(key, row[0], len(row[0].encode("utf-8")))
+            return row[0]
+
+    def put(self, key, text):
+        size = len(text.encode("utf-8"))
+        with self._lock:
+            self._remember(key, text, size)
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pdf_text (key, text, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, text, size, time.time())
+                )
+                self._disk_bytes += size
+                self._flush_touches()
+                if self._disk_bytes > self.disk_limit:
+                    self._trim_disk()
+                self._conn.commit()
+            except sqlite3.Error as exc:
+                log.warning("not caching extracted text on disk: %s", exc)
+                self._rollback()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits_memory + self.hits_disk + self.misses
+            disk_entries, disk_bytes = 0, 0
+            if self._conn is not None:
+                try:
+                    disk_entries, disk_bytes = self._conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pdf_text"
+                    ).fetchone()
+                except sqlite3.Error as exc:
+                    log.warning("PDF text cache stats unavailable: %s", exc)
+            return {
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "hit_ratio": (self.hits_memory + self.hits_disk) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": disk_entries,
+                "disk_bytes": disk_bytes,
+            }
+
+    # Callers must hold self._lock.
+    def _disk_get(self, key):
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute("SELECT text FROM pdf_text WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._touched[key] = time.time()
+                if (len(self._touched) >= TOUCH_BATCH
+                        or time.monotonic() - self._touched_at >= TOUCH_INTERVAL_SECONDS):
+                    self._flush_touches()
+                    self._conn.commit()
+        except sqlite3.Error as exc:
+            log.warning("PDF text cache lookup failed, treating it as a miss: %s", exc)
+            self._rollback()
+            return None
+        return row
+
+    def _rollback(self):
+        # Dropped touches only make those entries look older to the trimmer
+        self._touched.clear()
+        try:
+            self._conn.rollback()
+        except sqlite3.Error:
+            pass
+
+    def _flush_touches(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE pdf_text SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()]
+            )
+            self._touched.clear()
+        self._touched_at = time.monotonic()
+
+    def _count_disk_bytes(self):
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pdf_text").fetchone()[0]
+
+    def _remember(self, key, text, size):
+        if size > self.memory_limit:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old[1]
+        self._memory[key] = (text, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_limit:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self.evictions += 1
+
+    def _trim_disk(self):
+        self._disk_bytes = self._count_disk_bytes()
+        while self._disk_bytes > self.disk_limit:
+            rows = self._conn.execute(
+                "SELECT key, size FROM pdf_text ORDER BY last_used LIMIT ?", (TRIM_CHUNK,)
+            ).fetchall()
+            if not rows:
+                self._disk_bytes = 0
+                return
+            stale = []
+            for key, size in rows:
+                if self._disk_bytes <= self.disk_limit:
+                    break
+                stale.append((key,))
+                self._disk_bytes -= size
+            self._conn.executemany("DELETE FROM pdf_text WHERE key = ?", stale)
+            self.evictions += len(stale)
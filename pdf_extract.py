@@ -0,0 +1,246 @@
+# pdf_extract.py
+
+import io
+import multiprocessing
+import multiprocessing.connection
+import os
+import pickle
+import threading
+import time
+
+import metrics
+
+MAX_PDF_BYTES = 10 * 1024 * 1024
+MAX_PDF_PAGES = 40
+PAGE_TIMEOUT_SECONDS = 5.0
+PARALLEL_MIN_PAGES = 8
+EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
+MAX_LIVE_WORKERS = 2 * (os.cpu_count() or 1) + 2
+CHECKOUT_TIMEOUT_SECONDS = 30.0
+
+
+class PDFLimitError(ValueError):
+    pass
+
+
+# The worker process failed to start or died, which says nothing about the PDF
+class PDFWorkerError(RuntimeError):
+    pass
+
+
+# pdfplumber (and pdfminer/pypdfium2 under it) is the heaviest import in the
+# app, so it is loaded on the first PDF rather than at startup.
+def _pdfplumber():
+    import pdfplumber
+    return pdfplumber
+
+
+# ----------------- Page range workers -----------------
+# Each page is closed right after extraction so pdfplumber drops its cached
+# layout objects instead of holding every parsed page until the file is closed.
+def _iter_pages(data, start, stop):
+    with _pdfplumber().open(io.BytesIO(data)) as pdf:
+        for number in range(start, stop):
+            page = pdf.pages[number]
+            yield page.extract_text() or ""
+            page.close()
+
+
+# Exceptions cross the pipe pickled; pdfminer has a few that cannot be rebuilt
+def _portable(error):
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+# Worker process loop: reports "ready" once pdfplumber is imported, then for
+# each (data, start, stop) job sends one ("page", text) per page and a final
+# ("done", None), or ("error", exception).
+def _worker_main(conn):
+    _pdfplumber()
+    conn.send(("ready", None))
+    while True:
+        try:
+            data, start, stop = conn.recv()
+        except EOFError:
+            return
+        try:
+            for text in _iter_pages(data, start, stop):
+                conn.send(("page", text))
+        except Exception as e:
+            conn.send(("error", _portable(e)))
+        else:
+            conn.send(("done", None))
+
+
+class _Worker:
+    def __init__(self):
+        # spawn avoids forking a multi-threaded Streamlit/HTTP server process
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.get_context("spawn").Process(
+            target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        try:
+            self.conn.recv()
+        except EOFError:
+            self.kill()
+            raise PDFWorkerError("PDF worker process failed to start")
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+# ----------------- Worker checkout -----------------
+# A request checks out one worker per page range and has it to itself until
+# the range is done, so a worker that overruns its page budget is killed
+# without touching other requests. Up to EXTRACT_WORKERS idle workers are kept
+# warm for the next request; startup (spawn + pdfplumber import) happens at
+# checkout and never counts against a page budget.
+# At most MAX_LIVE_WORKERS worker processes exist at once, idle ones
+# included, so a burst of large uploads waits for a worker instead of
+# spawning one process per range. A request takes all of its workers in one
+# step, so two requests can't each hold half of what they need and wait on
+# each other; one that waits CHECKOUT_TIMEOUT_SECONDS gets PDFWorkerError.
+_idle = []
+_live = 0
+_pool_changed = threading.Condition()
+
+
+def _checkout(count):
+    global _live
+    deadline = time.monotonic() + CHECKOUT_TIMEOUT_SECONDS
+    with _pool_changed:
+        while True:
+            for worker in [worker for worker in _idle if not worker.process.is_alive()]:
+                _idle.remove(worker)
+                worker.kill()
+                _live -= 1
+            if len(_idle) + MAX_LIVE_WORKERS - _live >= count:
+                workers = [_idle.pop() for _ in range(min(count, len(_idle)))]
+                fresh = count - len(workers)
+                _live += fresh
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise PDFWorkerError(f"all {MAX_LIVE_WORKERS} PDF worker processes are busy")
+            _pool_changed.wait(remaining)
+    try:
+        for _ in range(fresh):
+            workers.append(_Worker())
+            fresh -= 1
+    except BaseException:
+        # Give back the slots of workers that never started, and the rest
+        with _pool_changed:
+            _live -= fresh
+            _pool_changed.notify_all()
+        for worker in workers:
+            _checkin(worker)
+        raise
+    return workers
+
+
+def _checkin(worker):
+    with _pool_changed:
+        if len(_idle) < max(EXTRACT_WORKERS, 1):
+            _idle.append(worker)
+            _pool_changed.notify_all()
+            return
+    _retire(worker)
+
+
+def _retire(worker):
+    global _live
+    worker.kill()
+    with _pool_changed:
+        _live -= 1
+        _pool_changed.notify_all()
+
+
+# Pool initializer for processes that are themselves workers (batch CLI, API
+# server): each already owns a core, so it extracts every PDF as one range.
+def disable_page_pool():
+    global EXTRACT_WORKERS
+    EXTRACT_WORKERS = 1
+
+
+def _split(count, parts):
+    size, extra = divmod(count, parts)
+    ranges, start = [], 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        if stop > start:
+            ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+# Runs each range on its own checked-out worker. Every range gets
+# page_timeout seconds per page, counted from when its worker received the
+# job (or sent its previous page); the first range to overrun has its worker
+# killed, and so do the request's other busy workers.
+def _run_ranges(data, ranges, page_timeout):
+    busy, done = {}, []
+    workers = _checkout(len(ranges))
+    try:
+        for worker, (start, stop) in zip(workers, ranges):
+            busy[worker.conn] = [worker, start, [], time.monotonic() + page_timeout]
+            worker.conn.send((data, start, stop))
+        while busy:
+            timeout = max(min(entry[3] for entry in busy.values()) - time.monotonic(), 0)
+            ready = multiprocessing.connection.wait(list(busy), timeout)
+            if not ready:
+                worker, start, texts, deadline = min(busy.values(), key=lambda entry: entry[3])
+                raise PDFLimitError(f"Page {start + len(texts) + 1} took longer than {page_timeout:g}s to extract.")
+            for conn in ready:
+                entry = busy[conn]
+                try:
+                    kind, value = conn.recv()
+                except EOFError:
+                    raise PDFWorkerError("PDF worker process died during extraction")
+                if kind == "page":
+                    entry[2].append(value)
+                    entry[3] = time.monotonic() + page_timeout
+                    continue
+                del busy[conn]
+                done.append(entry)
+                if kind == "error":
+                    raise value
+    finally:
+        # Workers never sent a range (a send failed) go back untouched
+        for worker in workers[len(busy) + len(done):]:
+            _checkin(worker)
+        for worker, *_ in busy.values():
+            _retire(worker)
+        for worker, *_ in done:
+            _checkin(worker)
+    return [text for _, start, texts, _ in sorted(done, key=lambda entry: entry[1]) for text in texts]
+
+
+# ----------------- Bounded extraction -----------------
+# The page count is checked up front. With a page_timeout, pages are
+# extracted in worker processes: small PDFs as one range, PDFs with
+# PARALLEL_MIN_PAGES or more pages split into one contiguous range per
+# worker. A worker that runs past the timeout on a page is killed, so a
+# pathological upload is actually stopped instead of just reported late.
+def extract_text(data, max_pages=MAX_PDF_PAGES, max_bytes=MAX_PDF_BYTES,
+                 page_timeout=PAGE_TIMEOUT_SECONDS, workers=None):
+    if workers is None:
+        workers = EXTRACT_WORKERS
+    if len(data) > max_bytes:
+        raise PDFLimitError(f"PDF is {len(data) // 1024} KB; the limit is {max_bytes // 1024} KB.")
+
+    with _pdfplumber().open(io.BytesIO(data)) as pdf:
+        page_count = len(pdf.pages)
+    if page_count > max_pages:
+        raise PDFLimitError(f"PDF has {page_count} pages; the limit is {max_pages}.")
+    metrics.PDF_PAGES.observe(page_count)
+
+    if page_timeout is None:
+        return "\n".join(_iter_pages(data, 0, page_count))
+    parts = 1 if page_count < PARALLEL_MIN_PAGES else min(max(workers, 1), MAX_LIVE_WORKERS)
+    return "\n".join(_run_ranges(data, _split(page_count, parts), page_timeout))
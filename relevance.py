@@ -0,0 +1,86 @@
+# relevance.py
+#
+# TF-IDF relevance score, reported next to the percentage score. The
+# percentage only asks whether each required skill appears; relevance also
+# weighs how often it is mentioned and how distinctive it is:
+#   relevance = sum over the role's skills of  weight(skill) * tf(mentions)
+# weight is the skill's idf (skills few roles ask for count more), normalized
+# so a role's weights sum to 1; tf grows with the log of the mention count and
+# saturates at SATURATION mentions. 100 means every required skill is
+# mentioned throughout the resume.
+#
+# Mentions are counted per term, where spellings from the catalog's "aliases"
+# ("k8s", "ms excel") collapse onto their canonical skill ("kubernetes",
+# "excel"). Resumes become rows of a resumes x terms matrix, so scoring a
+# batch against one role, or one resume against every role, is a single
+# matrix product. The vocabulary is a few hundred terms, so the matrices are
+# dense numpy arrays; each role also keeps its (term ids, weights) pair, so a
+# batch scored against one role only reads that role's columns.
+
+import itertools
+
+SATURATION = 4
+
+
+class RelevanceModel:
+    def __init__(self, requirements, aliases=None):
+        # imported here so importing backend stays cheap
+        import numpy as np
+
+        aliases = aliases or {}
+        vocabulary = {skill for roles in requirements.values() for skills in roles.values() for skill in skills}
+        self.terms = tuple(sorted({aliases.get(skill, skill) for skill in vocabulary}))
+        term_id = {term: i for i, term in enumerate(self.terms)}
+        # Every surface form the matcher reports -> its term column
+        self.term_of = {form: term_id[aliases.get(form, form)] for form in vocabulary | set(aliases)}
+        self.roles = [(company, designation) for company, roles in requirements.items() for designation in roles]
+        self.role_row = {role: i for i, role in enumerate(self.roles)}
+
+        incidence = np.zeros((len(self.roles), len(self.terms)), dtype=np.float32)
+        for i, (company, designation) in enumerate(self.roles):
+            incidence[i, [term_id[aliases.get(skill, skill)] for skill in requirements[company][designation]]] = 1
+        document_frequency = incidence.sum(axis=0)
+        self.idf = (np.log((1 + len(self.roles)) / (1 + document_frequency)) + 1).astype(np.float32)
+        weights = incidence * self.idf
+        self.weights = weights / weights.sum(axis=1, keepdims=True)
+        self.role_terms = [np.flatnonzero(row) for row in incidence]
+        self.role_weights = [self.weights[i, terms] for i, terms in enumerate(self.role_terms)]
+
+    # ----------------- Vectorizing -----------------
+    # mentions: one {surface form: count} mapping per resume (ResumeSections.mentions).
+    # Returns the resumes x terms matrix of saturated term frequencies.
+    def vectorize(self, mentions):
+        import numpy as np
+
+        term_of = self.term_of
+        pairs = [[(term_of[form], count) for form, count in counts.items() if form in term_of] for counts in mentions]
+        sizes = np.fromiter(map(len, pairs), dtype=np.int64, count=len(pairs))
+        flat = np.array(list(itertools.chain.from_iterable(pairs)), dtype=np.float32).reshape(-1, 2)
+        counts = np.zeros((len(pairs), len(self.terms)), dtype=np.float32)
+        # Aliases of one skill add up in the same column
+        np.add.at(counts, (np.repeat(np.arange(len(pairs)), sizes), flat[:, 0].astype(np.int64)), flat[:, 1])
+        tf = np.zeros_like(counts)
+        np.divide(1 + np.log(counts, where=counts > 0, out=np.zeros_like(counts)), 1 + np.log(SATURATION),
+                  where=counts > 0, out=tf)
+        return np.minimum(tf, 1, out=tf)
+
+    # ----------------- Scoring -----------------
+    # Relevance (0-100) of every row of `vectors` for one role; unknown roles score 0
+    def score_role(self, vectors, company, designation):
+        import numpy as np
+
+        row = self.role_row.get((company, designation))
+        if row is None:
+            return np.zeros(len(vectors), dtype=np.float32)
+        return vectors[:, self.role_terms[row]] @ self.role_weights[row] * 100
+
+    # resumes x roles relevance matrix, columns in self.roles order
+    def score_roles(self, vectors):
+        return vectors @ self.weights.T * 100
+
+    def score(self, mentions, company, designation):
+        return round(float(self.score_role(self.vectorize([mentions]), company, designation)[0]), 1)
+
+    def score_all(self, mentions):
+        scores = self.score_roles(self.vectorize([mentions]))[0]
+        return {role: round(float(value), 1) for role, value in zip(self.roles, scores)}
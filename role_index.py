@@ -0,0 +1,60 @@
+# role_index.py
+
+
+# ----------------- Role x Skill incidence index -----------------
+# Every skill in the catalog gets a column and every (company, designation)
+# pair a row of a 0/1 roles x skills matrix. Scoring a resume against all
+# roles is then one matrix-vector product with the resume's skill vector
+# instead of a fresh substring scan of the resume for every role, and the
+# ranking is one lexsort over the resulting counts.
+class RoleIndex:
+    def __init__(self, requirements):
+        # imported here so importing backend stays cheap
+        import numpy as np
+
+        vocabulary = sorted({skill for roles in requirements.values() for skills in roles.values() for skill in skills})
+        self.skill_col = {skill: i for i, skill in enumerate(vocabulary)}
+        self.roles = []
+        self.role_skills = []
+        for company, roles in requirements.items():
+            for designation, skills in roles.items():
+                self.roles.append((company, designation))
+                self.role_skills.append(skills)
+        self.incidence = np.zeros((len(self.roles), len(vocabulary)), dtype=np.float32)
+        for i, skills in enumerate(self.role_skills):
+            self.incidence[i, [self.skill_col[skill] for skill in skills]] = 1
+        self.totals = self.incidence.sum(axis=1).astype(np.int64)
+
+    def vector_for(self, skills):
+        import numpy as np
+
+        vector = np.zeros(len(self.skill_col), dtype=np.float32)
+        vector[[self.skill_col[skill] for skill in skills if skill in self.skill_col]] = 1
+        return vector
+
+    # Returns the roles sorted by score (best first), with found/missing skills
+    # decoded only for the top_n rows that are actually returned.
+    def rank(self, found_skills, top_n=None):
+        import numpy as np
+
+        found_skills = set(found_skills)
+        matched = (self.incidence @ self.vector_for(found_skills)).astype(np.int64)
+        # Same truncation as int(matched / total * 100); every role has skills
+        scores = (matched / np.maximum(self.totals, 1) * 100).astype(np.int64)
+        # lexsort is stable, so ties keep catalog order
+        order = np.lexsort((-matched, -scores))
+        if top_n is not None:
+            order = order[:top_n]
+
+        ranking = []
+        for i in order.tolist():
+            company, designation = self.roles[i]
+            skills = self.role_skills[i]
+            ranking.append({
+                "company": company,
+                "designation": designation,
+                "score": int(scores[i]),
+                "skills_found": [skill for skill in skills if skill in found_skills],
+                "missing": [skill for skill in skills if skill not in found_skills],
+            })
+        return ranking
@@ -0,0 +1,180 @@
+# rollups.py
+#
+# Reporting rollups kept up to date on every save, so the dashboard reads a
+# few hundred pre-aggregated rows instead of scanning resume_results:
+#   rollup_role_scores     submissions and score sum per company/role
+#   rollup_missing_skills  how often each role's skill was missing
+#   rollup_daily_volume    stored analyses and folded resubmissions per day
+# Rows moved to the Parquet archive (archive.py) stay counted here.
+#
+# Rows saved before the rollups existed are folded in by backfill(), which
+# walks resume_results in id order behind a watermark in `meta` (the same
+# table skill_index.py uses). Saves only update the rollups themselves once
+# the backfill has caught up to them; until then the backfill counts them, so
+# no row is ever counted twice.
+
+import skill_index
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS rollup_role_scores (
+        company TEXT NOT NULL,
+        designation TEXT NOT NULL,
+        submissions INTEGER NOT NULL DEFAULT 0,
+        score_sum INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (company, designation)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS rollup_missing_skills (
+        company TEXT NOT NULL,
+        designation TEXT NOT NULL,
+        skill TEXT NOT NULL,
+        missing_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (company, designation, skill)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS rollup_daily_volume (
+        day TEXT PRIMARY KEY,
+        submissions INTEGER NOT NULL DEFAULT 0,
+        resubmissions INTEGER NOT NULL DEFAULT 0,
+        score_sum INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+    ''',
+]
+
+BACKFILL_CHUNK = 5000
+WATERMARK_KEY = "rollup_backfill_id"
+
+
+# ----------------- Writes (run on the storage writer thread) -----------------
+def _apply(conn, company, designation, score, missing, date_analyzed):
+    company, designation, score = company or "", designation or "", score or 0
+    conn.execute(
+        '''
+        INSERT INTO rollup_role_scores (company, designation, submissions, score_sum) VALUES (?, ?, 1, ?)
+        ON CONFLICT (company, designation) DO UPDATE SET
+            submissions = submissions + 1, score_sum = score_sum + excluded.score_sum
+        ''',
+        (company, designation, score)
+    )
+    conn.executemany(
+        '''
+        INSERT INTO rollup_missing_skills (company, designation, skill, missing_count) VALUES (?, ?, ?, 1)
+        ON CONFLICT (company, designation, skill) DO UPDATE SET missing_count = missing_count + 1
+        ''',
+        [(company, designation, skill) for skill in {skill_index.normalize_skill(name) for name in missing}]
+    )
+    conn.execute(
+        '''
+        INSERT INTO rollup_daily_volume (day, submissions, score_sum) VALUES (?, 1, ?)
+        ON CONFLICT (day) DO UPDATE SET submissions = submissions + 1, score_sum = score_sum + excluded.score_sum
+        ''',
+        ((date_analyzed or "")[:10], score)
+    )
+
+
+# Called right after a row is inserted. Once the backfill has reached the
+# previous row, count this one and move the watermark past it; otherwise the
+# backfill will get to it.
+def add_result(conn, result_id, company, designation, score, missing, date_analyzed):
+    caught_up = conn.execute(
+        '''
+        SELECT CAST(value AS INTEGER) >= COALESCE((SELECT MAX(id) FROM resume_results WHERE id < ?), 0)
+        FROM meta WHERE key = ?
+        ''',
+        (result_id, WATERMARK_KEY)
+    ).fetchone()
+    if not caught_up or not caught_up[0]:
+        return
+    _apply(conn, company, designation, score, missing, date_analyzed)
+    conn.execute("UPDATE meta SET value = ? WHERE key = ?", (str(result_id), WATERMARK_KEY))
+
+
+def add_resubmission(conn, date_analyzed):
+    conn.execute(
+        '''
+        INSERT INTO rollup_daily_volume (day, resubmissions) VALUES (?, 1)
+        ON CONFLICT (day) DO UPDATE SET resubmissions = resubmissions + 1
+        ''',
+        (date_analyzed[:10],)
+    )
+
+
+def watermark(conn):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (WATERMARK_KEY,)).fetchone()
+    return int(row[0]) if row else 0
+
+
+# ----------------- Migration: backfill existing rows -----------------
+def _backfill_chunk(conn):
+    last_id = watermark(conn)
+    rows = conn.execute(
+        '''
+        SELECT id, company, designation, score, suggestions, date_analyzed FROM resume_results
+        WHERE id > ? ORDER BY id LIMIT ?
+        ''',
+        (last_id, BACKFILL_CHUNK)
+    ).fetchall()
+    for _, company, designation, score, suggestions, date_analyzed in rows:
+        _apply(conn, company, designation, score, skill_index.split_skills(suggestions), date_analyzed)
+    # Written even when there is nothing to fold in, so new saves know they're caught up
+    conn.execute(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+        (WATERMARK_KEY, str(rows[-1][0] if rows else last_id))
+    )
+    return len(rows)
+
+
+def backfill(storage):
+    total = 0
+    while True:
+        count = storage.write(_backfill_chunk)
+        total += count
+        if count < BACKFILL_CHUNK:
+            return total
+
+
+# ----------------- Reports -----------------
+# Each query reads only rollup rows: at most one per role, role skill or day.
+def role_scores(storage, company=None):
+    sql = '''
+        SELECT company, designation, submissions, ROUND(CAST(score_sum AS REAL) / submissions, 1)
+        FROM rollup_role_scores WHERE submissions > 0
+    '''
+    params = []
+    if company:
+        sql += " AND company = ?"
+        params.append(company)
+    sql += " ORDER BY company, designation"
+    return [dict(zip(("company", "designation", "submissions", "avg_score"), row)) for row in storage.query(sql, params)]
+
+
+def missing_skills(storage, company=None, designation=None, limit=15):
+    where, params = [], []
+    if company:
+        where.append("company = ?")
+        params.append(company)
+    if designation:
+        where.append("designation = ?")
+        params.append(designation)
+    sql = "SELECT skill, SUM(missing_count) AS missing FROM rollup_missing_skills"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " GROUP BY skill ORDER BY missing DESC, skill LIMIT ?"
+    return [{"skill": skill, "missing": missing} for skill, missing in storage.query(sql, params + [limit])]
+
+
+def daily_volume(storage, since=None):
+    sql = "SELECT day, submissions, resubmissions, score_sum FROM rollup_daily_volume"
+    params = []
+    if since:
+        sql += " WHERE day >= ?"
+        params.append(since)
+    sql += " ORDER BY day"
+    return [
+        {"day": day, "submissions": submissions, "resubmissions": resubmissions,
+         "avg_score": round(score_sum / submissions, 1) if submissions else None}
+        for day, submissions, resubmissions, score_sum in storage.query(sql, params)
+    ]
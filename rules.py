@@ -0,0 +1,282 @@
+# rules.py
+#
+# Declarative resume checks. Every check analyze_resume runs (role skills,
+# ATS section checks, length, fresher project checks) is a rule spec like
+#   {"id": "education_section", "type": "section", "section": "education",
+#    "message": "📌 No education section detected."}
+# compiled once per catalog into a RuleSet. Companies can add their own rules
+# in the catalog file's optional "rules" list, scoped with
+#   "when": {"company": [...], "designation": [...], "experience": [...]}
+#
+# Rules never scan the text: they read the ResumeSections index (section
+# names, per-section skills and words), which is built in one pass per
+# resume. The RuleSet indexes rules by company and caches the ordered plan
+# for each (company, designation, experience), so company rules cost nothing
+# for other companies' resumes. Each rule's latency and how often it fired
+# are exported as resume_rule_seconds / resume_rule_matches_total.
+
+import re
+import time
+
+import metrics
+from sections import PREAMBLE, SECTION_KEYWORDS
+
+# Feedback lands in "tips" or in the "ats_format" block, in rule order
+CHANNELS = ("tips", "ats")
+MAX_PLANS = 4096
+SECTION_NAMES = frozenset(SECTION_KEYWORDS.values()) | {PREAMBLE}
+
+DEFAULT_RULES = [
+    {"id": "role_skills", "type": "skills"},
+    {"id": "summary_section", "type": "section", "section": "summary", "keywords": ["objective", "summary"],
+     "message": "📌 Missing an objective or summary section."},
+    {"id": "experience_section", "type": "section", "section": "experience", "when": {"experience": ["experienced"]},
+     "keywords": ["experience", "experienced", "experiences"], "message": "📌 No experience section found."},
+    {"id": "education_section", "type": "section", "section": "education", "keywords": ["education", "educational"],
+     "message": "📌 No education section detected."},
+    {"id": "min_length", "type": "min_length", "chars": 500,
+     "message": "📌 Resume content too short, consider adding more details."},
+    {"id": "fresher_projects", "type": "projects", "when": {"experience": ["fresher"]}},
+]
+
+_word = re.compile(r"\w+")
+
+
+class RuleError(ValueError):
+    pass
+
+
+# ----------------- Rule types -----------------
+# Each type lists its optional spec fields with their defaults and the fields
+# a spec must set. apply() adds feedback to the Outcome and returns True when
+# the rule fired.
+class Rule:
+    fields = {}
+    required = ()
+    channel = "ats"
+
+    def __init__(self, spec, order):
+        self.id = spec["id"]
+        self.order = order
+        when = spec.get("when", {})
+        self.companies = frozenset(when.get("company", ()))
+        self.designations = frozenset(when.get("designation", ()))
+        self.experiences = frozenset(level.lower() for level in when.get("experience", ()))
+        self.channel = spec.get("channel", self.channel)
+        for field, default in self.fields.items():
+            setattr(self, field, spec.get(field, default))
+        for field in self.required:
+            setattr(self, field, spec[field])
+
+    def applies(self, designation, experience):
+        return ((not self.designations or designation in self.designations)
+                and (not self.experiences or experience in self.experiences))
+
+
+class SkillsRule(Rule):
+    fields = {"message": "💡 Add more details about your experience with **{skill}**."}
+    channel = "tips"
+
+    def apply(self, resume, outcome):
+        found = resume.skills
+        outcome.found = [skill for skill in outcome.role_skills if skill in found]
+        outcome.missing = [skill for skill in outcome.role_skills if skill not in found]
+        outcome.score = int(len(outcome.found) / len(outcome.role_skills) * 100) if outcome.role_skills else 0
+        outcome.add(self.channel, *(self.message.format(skill=skill) for skill in outcome.missing))
+        return bool(outcome.missing)
+
+
+# Fires when there is no `section` heading and none of `keywords` (single
+# words) appear anywhere, so "Experience Summary" or a one-line "Education
+# B.Tech 2020" still counts as having the section
+class SectionRule(Rule):
+    fields = {"keywords": ()}
+    required = ("section", "message")
+
+    def __init__(self, spec, order):
+        super().__init__(spec, order)
+        self.keywords = frozenset(keyword.lower() for keyword in self.keywords)
+
+    def apply(self, resume, outcome):
+        if resume.has(self.section) or not self.keywords.isdisjoint(resume.words):
+            return False
+        outcome.add(self.channel, self.message)
+        return True
+
+
+class MinLengthRule(Rule):
+    required = ("chars", "message")
+
+    def apply(self, resume, outcome):
+        if resume.length >= self.chars:
+            return False
+        outcome.add(self.channel, self.message)
+        return True
+
+
+# Fires when none of `terms` (single words) appear, in `section` or anywhere
+class TermsRule(Rule):
+    fields = {"section": None}
+    required = ("terms", "message")
+
+    def __init__(self, spec, order):
+        super().__init__(spec, order)
+        self.terms = frozenset(term.lower() for term in self.terms)
+
+    def apply(self, resume, outcome):
+        words = resume.words_in(self.section) if self.section else resume.words
+        if not self.terms.isdisjoint(words):
+            return False
+        outcome.add(self.channel, self.message)
+        return True
+
+
+class ProjectsRule(Rule):
+    fields = {
+        "message": "⚠️ No Projects section found. Consider adding detailed projects relevant to your desired job role.",
+        "unfocused_message": "⚠️ Your project descriptions don't highlight key skills for the job role. "
+                             "Add technologies/tools used in projects.",
+        "highlight_message": "✅ Projects highlight these relevant skills: {skills}",
+    }
+    channel = "tips"
+
+    def feedback(self, resume, role_skills):
+        if not resume.has("projects"):
+            return True, self.message
+        project_skills = resume.skills_in("projects")
+        mentioned = [skill for skill in role_skills if skill in project_skills]
+        if not mentioned:
+            return True, self.unfocused_message
+        return False, self.highlight_message.format(skills=", ".join(mentioned))
+
+    def apply(self, resume, outcome):
+        fired, message = self.feedback(resume, outcome.role_skills)
+        outcome.add(self.channel, message)
+        return fired
+
+
+RULE_TYPES = {
+    "skills": SkillsRule,
+    "section": SectionRule,
+    "min_length": MinLengthRule,
+    "terms": TermsRule,
+    "projects": ProjectsRule,
+}
+
+
+# ----------------- Validation -----------------
+def _check_spec(spec, companies):
+    if not isinstance(spec, dict):
+        raise RuleError(f"expected an object, got {spec!r}")
+    rule_id = spec.get("id")
+    if not isinstance(rule_id, str) or not rule_id.strip():
+        raise RuleError("every rule needs a non-empty string id")
+    rule_type = RULE_TYPES.get(spec.get("type"))
+    if rule_type is None:
+        raise RuleError(f"{rule_id}: type must be one of {', '.join(RULE_TYPES)}")
+    unknown = set(spec) - {"id", "type", "when", "channel"} - set(rule_type.fields) - set(rule_type.required)
+    if unknown:
+        raise RuleError(f"{rule_id}: unknown fields {', '.join(sorted(unknown))}")
+    missing = [field for field in rule_type.required if field not in spec]
+    if missing:
+        raise RuleError(f"{rule_id}: missing {', '.join(missing)}")
+    if spec.get("channel", rule_type.channel) not in CHANNELS:
+        raise RuleError(f"{rule_id}: channel must be one of {', '.join(CHANNELS)}")
+    when = spec.get("when", {})
+    if not isinstance(when, dict) or set(when) - {"company", "designation", "experience"}:
+        raise RuleError(f"{rule_id}: when may only scope by company, designation and experience")
+    for scope, values in when.items():
+        if not isinstance(values, list) or not values or not all(isinstance(v, str) and v for v in values):
+            raise RuleError(f"{rule_id}: when.{scope} must be a non-empty list of strings")
+    unknown_companies = set(when.get("company", ())) - set(companies)
+    if unknown_companies:
+        raise RuleError(f"{rule_id}: unknown companies {', '.join(sorted(unknown_companies))}")
+    if "chars" in spec and (not isinstance(spec["chars"], int) or spec["chars"] < 0):
+        raise RuleError(f"{rule_id}: chars must be a non-negative integer")
+    for field in ("terms", "keywords"):
+        if field in spec:
+            terms = spec[field]
+            # Rules match against the word index, so a term must be a single word
+            if not isinstance(terms, list) or not terms or not all(isinstance(t, str) and _word.fullmatch(t) for t in terms):
+                raise RuleError(f"{rule_id}: {field} must be a non-empty list of single words")
+    for field in ("message", "unfocused_message", "highlight_message", "section"):
+        if field in spec and (not isinstance(spec[field], str) or not spec[field].strip()):
+            raise RuleError(f"{rule_id}: {field} must be a non-empty string")
+    if "section" in spec and spec["section"] not in SECTION_NAMES:
+        raise RuleError(f"{rule_id}: section must be one of {', '.join(sorted(SECTION_NAMES))}")
+    return rule_type
+
+
+# ----------------- Evaluation -----------------
+class Outcome:
+    __slots__ = ("role_skills", "found", "missing", "score", "tips", "ats")
+
+    def __init__(self, role_skills):
+        self.role_skills = role_skills
+        self.found, self.missing, self.score = [], [], 0
+        self.tips, self.ats = [], []
+
+    def add(self, channel, *messages):
+        (self.tips if channel == "tips" else self.ats).extend(messages)
+
+
+class RuleSet:
+    def __init__(self, specs, companies=()):
+        self.rules = []
+        self._global = []
+        self._by_company = {}
+        seen = set()
+        for order, spec in enumerate(specs):
+            rule_type = _check_spec(spec, companies)
+            if spec["id"] in seen:
+                raise RuleError(f"duplicate rule id {spec['id']!r}")
+            seen.add(spec["id"])
+            rule = rule_type(spec, order)
+            self.rules.append(rule)
+            if rule.companies:
+                for company in rule.companies:
+                    self._by_company.setdefault(company, []).append(rule)
+            else:
+                self._global.append(rule)
+        self._plans = {}
+
+    # Rules for one company/role/experience level in declaration order; only
+    # the global rules and that company's own rules are ever looked at.
+    def plan(self, company, designation, experience):
+        key = (company, designation, experience)
+        plan = self._plans.get(key)
+        if plan is None:
+            candidates = self._global + self._by_company.get(company, [])
+            plan = tuple(sorted((rule for rule in candidates if rule.applies(designation, experience)),
+                                key=lambda rule: rule.order))
+            if len(self._plans) >= MAX_PLANS:
+                self._plans.clear()
+            self._plans[key] = plan
+        return plan
+
+    def evaluate(self, resume, company, designation, experience, role_skills):
+        outcome = Outcome(role_skills)
+        clock = time.perf_counter
+        for rule in self.plan(company, designation, (experience or "").lower()):
+            started = clock()
+            fired = rule.apply(resume, outcome)
+            metrics.RULE_SECONDS.observe(clock() - started, rule=rule.id)
+            if fired:
+                metrics.RULE_MATCHES.inc(rule=rule.id)
+        return outcome
+
+    # Plans are rebuilt lazily, so compiled catalogs pickle without them
+    def __getstate__(self):
+        return dict(self.__dict__, _plans={})
+
+
+def compile_rules(extra_specs=(), companies=()):
+    return RuleSet(DEFAULT_RULES + list(extra_specs), companies)
+
+
+# Project feedback with the default wording, for callers outside a RuleSet
+_default_projects = ProjectsRule({"id": "fresher_projects"}, 0)
+
+
+def project_feedback(resume, role_skills):
+    return _default_projects.feedback(resume, role_skills)[1]
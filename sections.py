@@ -0,0 +1,144 @@
+# sections.py
+
+import re
+from collections import Counter
+
+
+# ----------------- Heading vocabulary -----------------
+# A line (or the part before its colon) is a heading when it is short, has no
+# digits or sentence punctuation, and ends with a section keyword, optionally
+# followed by one of HEADING_TAILS: "machine learning projects" and "project
+# details" are headings, while a "skills used: java" label inside a project
+# is not. The first keyword wins, so "project experience" is a projects
+# heading and "work experience" is not. HEADING_PHRASES covers common
+# headings without a keyword ("academic background", "work history").
+SECTION_KEYWORDS = {
+    "objective": "summary", "summary": "summary", "profile": "summary",
+    "experience": "experience", "experiences": "experience", "employment": "experience",
+    "internship": "experience", "internships": "experience",
+    "education": "education", "academics": "education", "qualification": "education", "qualifications": "education",
+    "project": "projects", "projects": "projects",
+    "skill": "skills", "skills": "skills", "competencies": "skills",
+    "certification": "certifications", "certifications": "certifications", "certificates": "certifications",
+    "courses": "certifications",
+    "achievements": "achievements", "awards": "achievements", "honors": "achievements",
+    "activities": "activities", "extracurricular": "activities", "volunteering": "activities",
+    "hobbies": "interests", "interests": "interests",
+    "languages": "languages", "publications": "publications", "references": "references",
+    "declaration": "declaration", "contact": "contact",
+}
+HEADING_TAILS = frozenset({"details", "undertaken", "section", "tools"})
+HEADING_PHRASES = {
+    "academic background": "education", "educational background": "education",
+    "work history": "experience", "employment history": "experience", "professional background": "experience",
+}
+MAX_HEADING_WORDS = 4
+MAX_HEADING_CHARS = 40
+PREAMBLE = "header"
+_HEADING_STRIP = " \t\r\n-*•#|"
+
+_heading_words = re.compile(r"[a-z]+")
+_words = re.compile(r"\w+")
+_not_heading = re.compile(r"[0-9.,;!?@]")
+
+
+def heading_section(candidate):
+    candidate = candidate.strip(_HEADING_STRIP)
+    if not candidate or len(candidate) > MAX_HEADING_CHARS or _not_heading.search(candidate):
+        return None
+    words = _heading_words.findall(candidate.lower())
+    if not words or len(words) > MAX_HEADING_WORDS:
+        return None
+    phrase = HEADING_PHRASES.get(" ".join(words))
+    if phrase is not None:
+        return phrase
+    last = len(words) - 1
+    while last > 0 and words[last] in HEADING_TAILS:
+        last -= 1
+    if words[last] not in SECTION_KEYWORDS:
+        return None
+    for word in words:
+        if word in SECTION_KEYWORDS:
+            return SECTION_KEYWORDS[word]
+    return None
+
+
+class Section:
+    __slots__ = ("name", "heading", "start", "end", "skills", "mentions", "words")
+
+    def __init__(self, name, heading, start, end, skills, mentions, words):
+        self.name, self.heading, self.start, self.end = name, heading, start, end
+        self.skills, self.mentions, self.words = skills, mentions, words
+
+    def as_dict(self):
+        return {"name": self.name, "heading": self.heading, "start": self.start, "end": self.end,
+                "skills": sorted(self.skills)}
+
+
+# ----------------- Section-span index -----------------
+# Splits the resume into sections in one pass over its lines, then runs the
+# skill matcher and the word tokenizer once per section body. Everything
+# downstream (the rule engine, project analysis, scoring) reads this index
+# instead of rescanning the text.
+# Offsets are into the original text. A section's body starts at its heading
+# line, so words on that line count for it: "machine learning projects" and
+# "skills: python, sql" put their skills in projects and skills.
+# `mentions` counts every match, leftmost-longest so "ms excel" is one mention
+# and not also one of "excel"; `aliases` are surface forms (like "k8s") that
+# are only counted as mentions, never reported as skills.
+class ResumeSections:
+    def __init__(self, text, matcher, aliases=frozenset()):
+        self.length = len(text)
+        spans = []
+        name, heading, body_start = PREAMBLE, "", 0
+        offset = 0
+        for line in text.splitlines(keepends=True):
+            candidate = line.partition(":")[0]
+            section = heading_section(candidate)
+            if section is not None:
+                spans.append((name, heading, body_start, offset))
+                name, heading, body_start = section, candidate.strip(_HEADING_STRIP), offset
+            offset += len(line)
+        spans.append((name, heading, body_start, offset))
+
+        self.sections = []
+        for name, heading, start, end in spans:
+            if name == PREAMBLE and not text[start:end].strip():
+                continue
+            body = text[start:end]
+            found, mentions, covered = set(), Counter(), 0
+            for match_start, match_end, skill in sorted(matcher.finditer(body), key=lambda m: (m[0], -m[1])):
+                found.add(skill)
+                if match_start >= covered:
+                    mentions[skill] += 1
+                    covered = match_end
+            words = set(_words.findall(body.lower()))
+            self.sections.append(Section(name, heading, start, end, found - aliases, mentions, words))
+        self.names = frozenset(section.name for section in self.sections)
+        self.skills = set().union(*(section.skills for section in self.sections))
+        self.mentions = sum((section.mentions for section in self.sections), Counter())
+        self.words = set().union(*(section.words for section in self.sections))
+        self._text = text
+
+    def has(self, name):
+        return name in self.names
+
+    def text_of(self, name):
+        return "\n".join(self._text[s.start:s.end].strip() for s in self.sections if s.name == name)
+
+    def skills_in(self, name):
+        return set().union(*(s.skills for s in self.sections if s.name == name))
+
+    def words_in(self, name):
+        return set().union(*(s.words for s in self.sections if s.name == name))
+
+    # {skill: [section names]} in resume order, e.g. {"sql": ["skills", "projects"]}
+    def locations(self, skills=None):
+        found = {}
+        for section in self.sections:
+            for skill in section.skills:
+                if skills is None or skill in skills:
+                    places = found.setdefault(skill, [])
+                    if section.name not in places:
+                        places.append(section.name)
+        return found
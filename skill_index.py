@@ -0,0 +1,178 @@
+# skill_index.py
+#
+# Normalized skill store: every skill name gets an integer ID in `skills`, and
+# `result_skills` holds one posting per (skill, found/missing, result). The
+# posting table is clustered on (skill_id, found, result_id), so each skill's
+# posting list is a contiguous, id-ordered range that SQLite can intersect
+# without touching resume_results until the final join.
+
+import argparse
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS skills (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        found_count INTEGER NOT NULL DEFAULT 0
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS result_skills (
+        skill_id INTEGER NOT NULL,
+        found INTEGER NOT NULL,
+        result_id INTEGER NOT NULL,
+        PRIMARY KEY (skill_id, found, result_id)
+    ) WITHOUT ROWID
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_result_skills_result ON result_skills (result_id)",
+    '''
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    ''',
+]
+
+BACKFILL_CHUNK = 5000
+
+
+def normalize_skill(name):
+    return " ".join(name.lower().split())
+
+
+def split_skills(joined):
+    return [normalize_skill(part) for part in (joined or "").split(",") if part.strip()]
+
+
+# ----------------- Writes (run on the storage writer thread) -----------------
+def skill_ids(conn, names):
+    names = sorted({normalize_skill(name) for name in names})
+    if not names:
+        return {}
+    conn.executemany("INSERT OR IGNORE INTO skills (name) VALUES (?)", [(name,) for name in names])
+    placeholders = ", ".join("?" * len(names))
+    return dict(conn.execute(f"SELECT name, id FROM skills WHERE name IN ({placeholders})", names).fetchall())
+
+
+# found_count is the length of each skill's "found" posting list, kept so
+# searches can start from the rarest skill without counting postings.
+def index_result(conn, result_id, found, missing):
+    ids = skill_ids(conn, list(found) + list(missing))
+    for names, flag in ((found, 1), (missing, 0)):
+        for skill_id in {ids[normalize_skill(name)] for name in names}:
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO result_skills (skill_id, found, result_id) VALUES (?, ?, ?)",
+                (skill_id, flag, result_id)
+            ).rowcount
+            if inserted and flag:
+                conn.execute("UPDATE skills SET found_count = found_count + 1 WHERE id = ?", (skill_id,))
+
+
+# Drops the postings of archived rows and keeps found_count in step
+def remove_results(conn, result_ids):
+    for result_id in result_ids:
+        found = conn.execute(
+            "SELECT skill_id FROM result_skills WHERE result_id = ? AND found = 1", (result_id,)
+        ).fetchall()
+        conn.executemany("UPDATE skills SET found_count = found_count - 1 WHERE id = ?", found)
+        conn.execute("DELETE FROM result_skills WHERE result_id = ?", (result_id,))
+
+
+# ----------------- Migration: backfill existing rows -----------------
+# Walks resume_results in id order and indexes the comma-joined skills_found /
+# suggestions columns. Progress is stored in `meta`, so it can be interrupted
+# and rerun, and rows saved after this migration are never rescanned.
+def _backfill_chunk(conn):
+    row = conn.execute("SELECT value FROM meta WHERE key = 'skill_backfill_id'").fetchone()
+    last_id = int(row[0]) if row else 0
+    rows = conn.execute(
+        "SELECT id, skills_found, suggestions FROM resume_results WHERE id > ? ORDER BY id LIMIT ?",
+        (last_id, BACKFILL_CHUNK)
+    ).fetchall()
+    for result_id, skills_found, suggestions in rows:
+        index_result(conn, result_id, split_skills(skills_found), split_skills(suggestions))
+    # Written even when there is nothing to index, so advance_backfill has a row to move
+    conn.execute(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES ('skill_backfill_id', ?)",
+        (str(rows[-1][0] if rows else last_id),)
+    )
+    return len(rows)
+
+
+def backfill(storage):
+    total = 0
+    while True:
+        count = storage.write(_backfill_chunk)
+        total += count
+        if count < BACKFILL_CHUNK:
+            return total
+
+
+# Called for rows saved after the index existed: once the backfill has reached
+# the previous row, move its watermark past this one so it is never rescanned.
+def advance_backfill(conn, result_id):
+    conn.execute(
+        '''
+        UPDATE meta SET value = ? WHERE key = 'skill_backfill_id'
+        AND CAST(value AS INTEGER) >= COALESCE((SELECT MAX(id) FROM resume_results WHERE id < ?), 0)
+        ''',
+        (str(result_id), result_id)
+    )
+
+
+# ----------------- Recruiter search -----------------
+# Candidates whose stored analysis found *all* of `skills`, newest first.
+# The rarest skill's posting list drives the scan in result_id order and every
+# other skill is a primary-key probe, so a page stops reading as soon as it
+# has `limit` hits instead of materializing every posting list.
+def search_candidates(storage, skills, min_score=None, company=None, designation=None, before_id=None, limit=50):
+    names = sorted({normalize_skill(skill) for skill in skills if skill.strip()})
+    if not names:
+        return []
+    placeholders = ", ".join("?" * len(names))
+    known = storage.query(f"SELECT id FROM skills WHERE name IN ({placeholders}) ORDER BY found_count", names)
+    if len(known) < len(names):
+        return []
+
+    driver, *others = [skill_id for (skill_id,) in known]
+    where = ["p0.skill_id = ?", "p0.found = 1"]
+    params = [driver]
+    for skill_id in others:
+        where.append(
+            "EXISTS (SELECT 1 FROM result_skills p WHERE p.skill_id = ? AND p.found = 1 AND p.result_id = p0.result_id)"
+        )
+        params.append(skill_id)
+    if before_id is not None:
+        where.append("p0.result_id < ?")
+        params.append(before_id)
+    if min_score is not None:
+        where.append("r.score >= ?")
+        params.append(min_score)
+    if company:
+        where.append("r.company = ?")
+        params.append(company)
+    if designation:
+        where.append("r.designation = ?")
+        params.append(designation)
+
+    sql = f'''
+        SELECT r.id, r.name, r.company, r.designation, r.experience, r.score, r.date_analyzed
+        FROM result_skills p0 JOIN resume_results r ON r.id = p0.result_id
+        WHERE {" AND ".join(where)}
+        ORDER BY p0.result_id DESC LIMIT ?
+    '''
+    params.append(limit)
+    return storage.query(sql, params)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the normalized skill index.")
+    parser.add_argument("--backfill", action="store_true", help="index rows saved before the skill index existed")
+    args = parser.parse_args(argv)
+    if args.backfill:
+        import storage
+        print(f"indexed {backfill(storage.Storage(schema=storage.SCHEMA + SCHEMA))} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# storage.py
+
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+import metrics
+
+DB_PATH = "resume_analysis.db"
+BUSY_TIMEOUT_MS = 10000
+WRITE_QUEUE_SIZE = 1024
+MAX_GROUP_SIZE = 256
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS resume_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        experience TEXT,
+        company TEXT,
+        designation TEXT,
+        skills_found TEXT,
+        score INTEGER,
+        suggestions TEXT,
+        ats_format TEXT,
+        date_analyzed TEXT
+    )
+    ''',
+    # Single-column indexes end in the rowid, so "col = ? AND id < ? ORDER BY id DESC"
+    # (keyset-paginated history) walks the index without a sort step.
+    "CREATE INDEX IF NOT EXISTS idx_results_date_analyzed ON resume_results (date_analyzed)",
+    "CREATE INDEX IF NOT EXISTS idx_results_company ON resume_results (company)",
+    "CREATE INDEX IF NOT EXISTS idx_results_company_designation ON resume_results (company, designation)",
+    "CREATE INDEX IF NOT EXISTS idx_results_designation ON resume_results (designation)",
+]
+
+
+# ----------------- SQLite storage layer -----------------
+# Readers get one connection per thread (WAL lets them run alongside the
+# writer). All writes go through a single writer thread that drains whatever
+# is queued and commits it as one transaction, so a burst of submissions
+# costs one fsync instead of one per insert. Each queued write runs inside
+# its own SAVEPOINT, so a failing write is rolled back on its own without
+# taking the rest of the group down with it.
+class Storage:
+    def __init__(self, path=DB_PATH, schema=SCHEMA):
+        self.path = path
+        self._local = threading.local()
+        self._queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._closed = False
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        for statement in schema:
+            conn.execute(statement)
+        conn.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="storage-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ----------------- Reads -----------------
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def query(self, sql, params=()):
+        return self.connection().execute(sql, params).fetchall()
+
+    # ----------------- Writes -----------------
+    # fn(conn) runs on the writer thread inside the group transaction; its
+    # return value (or exception) is delivered through the returned Future.
+    def submit(self, fn):
+        if self._closed:
+            raise RuntimeError("storage is closed")
+        future = Future()
+        self._queue.put((fn, future, time.perf_counter()))
+        return future
+
+    def write(self, fn):
+        return self.submit(fn).result()
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            group = [item]
+            stop = False
+            while len(group) < MAX_GROUP_SIZE:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                group.append(item)
+            self._commit_group(conn, group)
+            if stop:
+                break
+        conn.close()
+
+    def _commit_group(self, conn, group):
+        outcomes = []
+        started = time.perf_counter()
+        metrics.DB_GROUP_SIZE.observe(len(group))
+        for _, _, queued_at in group:
+            metrics.DB_QUEUE_WAIT_SECONDS.observe(started - queued_at)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Non-zero only when another process (batch CLI, API server) holds the write lock
+            metrics.DB_LOCK_WAIT_SECONDS.observe(time.perf_counter() - started)
+            for fn, future, _ in group:
+                conn.execute("SAVEPOINT queued_write")
+                try:
+                    outcomes.append((future, fn(conn), None))
+                    conn.execute("RELEASE queued_write")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO queued_write")
+                    conn.execute("RELEASE queued_write")
+                    outcomes.append((future, None, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, future, _ in group:
+                future.set_exception(e)
+            return
+        for future, value, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(value)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
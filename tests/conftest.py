@@ -0,0 +1,20 @@
+# tests/conftest.py
+#
+# Modules live at the repository root; tests import them directly. Test PDFs
+# come from the benchmark corpus builder.
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+
+from corpus import build_pdf_pages  # noqa: E402
+
+
+@pytest.fixture
+def make_pdf():
+    return build_pdf_pages
@@ -0,0 +1,145 @@
+# tests/test_api_server.py
+#
+# Runs AnalyzerServer on a free port against a throwaway database, PDF cache
+# and spool in a temporary directory.
+
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+import api_server
+import backend
+
+ROLE = "company=TCS&designation=Software%20Developer"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def workdir(tmp_path_factory):
+    previous = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("api"))
+    yield
+    if backend._db is not None:
+        backend._db.close()
+        backend._db = None
+    os.chdir(previous)
+
+
+def serve(scenario, **options):
+    async def run():
+        server = await api_server.AnalyzerServer(port=0, workers=1, job_workers=0, **options).start()
+        task = asyncio.create_task(server.serve_forever())
+        try:
+            return await scenario(server.port)
+        finally:
+            task.cancel()
+            await server.close()
+
+    return asyncio.run(run())
+
+
+async def request(port, method, path, body=b""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = dict(line.lower().split(": ", 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, body
+
+
+def dechunk(body):
+    out = b""
+    while True:
+        size, _, rest = body.partition(b"\r\n")
+        size = int(size, 16)
+        if size == 0:
+            return out
+        out, body = out + rest[:size], rest[size + 2:]
+
+
+def test_analyze_valid_and_corrupt_pdf(make_pdf):
+    pdf = make_pdf([["Summary", "Java developer using spring and git", "Education", "B.Tech"]])
+
+    async def scenario(port):
+        return (await request(port, "POST", f"/analyze?{ROLE}&name=asha", pdf),
+                await request(port, "POST", f"/analyze?{ROLE}", b"%PDF-1.4 not really a pdf"))
+
+    (status, _, body), (bad_status, _, bad_body) = serve(scenario)
+    assert status == 200
+    result = json.loads(body)
+    assert {"java", "spring", "git"} <= set(result["skills_found"])
+    assert result["saved"]["stored"] is True
+    assert bad_status == 422 and "Unreadable PDF" in json.loads(bad_body)["error"]
+
+
+def test_saturated_server_answers_429():
+    async def scenario(port):
+        # Admitted, then stuck waiting for a body that never comes
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"POST /analyze?{ROLE} HTTP/1.1\r\nContent-Length: 100\r\n\r\n".encode())
+        await writer.drain()
+        for _ in range(100):
+            status, _, body = await request(port, "GET", "/health")
+            if json.loads(body)["in_flight"]:
+                break
+            await asyncio.sleep(0.01)
+        try:
+            return await request(port, "POST", f"/analyze?{ROLE}", b"x")
+        finally:
+            writer.close()
+
+    status, headers, _ = serve(scenario, max_in_flight=1)
+    assert status == 429 and headers["retry-after"] == "1"
+
+
+def test_history_is_streamed_in_chunks(monkeypatch):
+    result = {"skills_found": ["java"], "missing": ["sql"], "score": 50, "ats_format": ""}
+    backend.insert_results([(f"candidate{i}", "TCS", "Software Developer", "Fresher", result) for i in range(5)])
+    monkeypatch.setattr(api_server, "HISTORY_PAGE_SIZE", 2)
+
+    status, headers, body = serve(lambda port: request(port, "GET", "/history?company=TCS&max_rows=3"))
+    assert status == 200 and headers["transfer-encoding"] == "chunked"
+    assert body.count(b"\r\n0\r\n\r\n") == 1 and body.endswith(b"0\r\n\r\n")
+    rows = [json.loads(line) for line in dechunk(body).splitlines()]
+    assert len(rows) == 3 and rows[0]["id"] > rows[1]["id"] > rows[2]["id"]
+
+
+def test_history_query_failure_is_a_single_error_response(monkeypatch):
+    def broken(**filters):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(backend, "get_history_page", broken)
+    status, headers, body = serve(lambda port: request(port, "GET", "/history"))
+    assert status == 500 and "transfer-encoding" not in headers
+    assert json.loads(body) == {"error": "RuntimeError: database is locked"}
+
+
+def test_timed_out_job_holds_its_slot_until_the_pool_finishes(monkeypatch):
+    monkeypatch.setattr(api_server, "CPU_TIMEOUT_SECONDS", 0.5)
+
+    async def run():
+        server = await api_server.AnalyzerServer(port=0, workers=1, job_workers=0).start()
+        try:
+            # Warm the pool process so the timed job is running, not queued
+            await asyncio.wrap_future(server._cpu_pool.submit(time.sleep, 0))
+            with pytest.raises(api_server.HTTPError) as error:
+                await server._run_cpu(time.sleep, 1.5)
+            held = server.in_flight
+            await asyncio.sleep(1.5)
+            return error.value.status, held, server.in_flight
+        finally:
+            await server.close()
+
+    status, held, after = asyncio.run(run())
+    assert status == 504 and held == 1 and after == 0
+
+
+@pytest.mark.parametrize("path", ["/history?max_rows=-3", "/history?max_rows=0", "/score-all?top_n=-2"])
+def test_counts_below_one_are_rejected(path):
+    status, _, body = serve(lambda port: request(port, "POST" if "score" in path else "GET", path, b"%PDF"))
+    assert status == 400 and "must be at least 1" in json.loads(body)["error"]
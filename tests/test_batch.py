@@ -0,0 +1,33 @@
+# tests/test_batch.py
+
+import json
+
+import batch
+
+
+def _run(tmp_path, out):
+    paths = sorted(str(path) for path in (tmp_path / "pdfs").iterdir())
+    return batch.run_batch(paths, "TCS", "Software Developer", "Fresher", str(out),
+                           checkpoint_path=str(out) + ".checkpoint", workers=1, db_batch_size=2, save_to_db=False)
+
+
+def test_resume_retries_failures_without_repeating_lines(tmp_path, make_pdf):
+    (tmp_path / "pdfs").mkdir()
+    for i in range(3):
+        (tmp_path / "pdfs" / f"r{i}.pdf").write_bytes(make_pdf([["Summary", f"java developer {i}"]]))
+    (tmp_path / "pdfs" / "zbad.pdf").write_bytes(b"not a pdf")
+    out = tmp_path / "out.jsonl"
+    checkpoint = tmp_path / "out.jsonl.checkpoint"
+
+    assert _run(tmp_path, out) == {"ok": 3, "error": 1, "skipped": 0}
+    assert "zbad.pdf" not in checkpoint.read_text()
+
+    # Interrupted run: r2's line is on disk but not checkpointed, a later line is cut short
+    lines = checkpoint.read_text().splitlines()
+    checkpoint.write_text("\n".join(lines[:2]) + "\n")
+    out.write_text(out.read_text() + '{"file": "tr')
+
+    assert _run(tmp_path, out) == {"ok": 1, "error": 1, "skipped": 2}
+    items = [json.loads(line) for line in out.read_text().splitlines()]
+    assert sorted(item["file"].rsplit("/", 1)[1] for item in items) == ["r0.pdf", "r1.pdf", "r2.pdf", "zbad.pdf"]
+    assert len(checkpoint.read_text().splitlines()) == 3
@@ -0,0 +1,103 @@
+# tests/test_catalog.py
+
+import json
+import os
+
+import pytest
+
+import catalog
+from catalog import CatalogError
+
+
+def document(version="v1", companies=None, **extra):
+    return {
+        "schema_version": catalog.SCHEMA_VERSION,
+        "catalog_version": version,
+        "companies": companies or {"TCS": {"Software Developer": ["Java", "SQL", "git"]}},
+        **extra,
+    }
+
+
+def test_parse_normalizes_and_dedupes_skills():
+    _, requirements, _, _ = catalog.parse(json.dumps(document(
+        companies={"TCS": {"Software Developer": ["Java", "java ", "Rest  API"]}}
+    )))
+    assert requirements == {"TCS": {"Software Developer": ("java", "rest api")}}
+
+
+def test_duplicate_keys_are_rejected():
+    raw = ('{"schema_version": 1, "catalog_version": "v1", "companies": {'
+           '"IBM": {"Developer": ["java"]}, "IBM": {"Tester": ["selenium"]}}}')
+    with pytest.raises(CatalogError, match="duplicate key 'IBM'"):
+        catalog.parse(raw)
+
+
+@pytest.mark.parametrize("aliases, message", [
+    ({"java": ["jdk"], "sql": ["jdk"]}, "listed under both"),
+    ({"java": ["java"]}, "cannot be an alias"),
+    # Chains: "jdk" is an alias of java and a canonical skill of its own group
+    ({"java": ["jdk"], "jdk": ["openjdk"]}, "cannot be an alias"),
+    ({"python": ["py"]}, "not a skill of any role"),
+    ({"java": []}, "non-empty list"),
+])
+def test_alias_conflicts_are_rejected(aliases, message):
+    with pytest.raises(CatalogError, match=message):
+        catalog.parse(json.dumps(document(aliases=aliases)))
+
+
+@pytest.mark.parametrize("rule_specs, message", [
+    ({"id": "x"}, "rules must be a list"),
+    ([{"id": "x", "type": "nope"}], "type must be one of"),
+    ([{"id": "x", "type": "min_length", "message": "short", "chars": -1}], "chars must be"),
+    ([{"id": "x", "type": "min_length", "message": "short", "chars": 10, "when": {"company": ["Nowhere"]}}],
+     "unknown companies"),
+    ([{"id": "x", "type": "min_length", "message": "a", "chars": 1},
+      {"id": "x", "type": "min_length", "message": "b", "chars": 1}], "duplicate rule id"),
+])
+def test_bad_rules_are_rejected(rule_specs, message):
+    with pytest.raises(CatalogError, match=message):
+        catalog.parse(json.dumps(document(rules=rule_specs)))
+
+
+# ----------------- Hot reload -----------------
+@pytest.fixture
+def live_catalog(tmp_path, monkeypatch):
+    path = tmp_path / "skill_catalog.json"
+    monkeypatch.setattr(catalog, "CATALOG_PATH", str(path))
+    monkeypatch.setattr(catalog, "COMPILED_DIR", str(tmp_path / "compiled"))
+    monkeypatch.setattr(catalog, "RELOAD_CHECK_SECONDS", 0.0)
+    monkeypatch.setattr(catalog, "_current", None)
+    monkeypatch.setattr(catalog, "_signature", None)
+    monkeypatch.setattr(catalog, "_checked_at", 0.0)
+
+    def write(content):
+        path.write_text(content if isinstance(content, str) else json.dumps(content))
+        # Make every write a new signature even within one mtime tick
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    return write
+
+
+def test_bad_edit_keeps_the_previous_version(live_catalog):
+    live_catalog(document("v1"))
+    assert catalog.current().version == "v1"
+
+    live_catalog('{"schema_version": 1, "catalog_version": "v2", "companies": {')
+    assert catalog.current().version == "v1"
+    live_catalog(document("v2", companies={"TCS": {"Tester": []}}))
+    assert catalog.current().version == "v1"
+
+
+def test_digest_change_swaps_the_catalog(live_catalog):
+    live_catalog(document("v1"))
+    first = catalog.current()
+
+    # Same bytes, new mtime: nothing to swap
+    live_catalog(document("v1"))
+    assert catalog.current() is first
+
+    live_catalog(document("v2", companies={"Infosys": {"Tester": ["selenium"]}}))
+    second = catalog.current()
+    assert second.version == "v2" and second.digest != first.digest
+    assert list(catalog.RequirementsView()) == ["Infosys"]
@@ -0,0 +1,68 @@
+# tests/test_fingerprint.py
+
+import random
+import sqlite3
+
+import pytest
+
+import fingerprint
+import skill_index
+
+WORDS = ("delivered improved designed collaborated team stakeholders release quality customers reduced latency "
+         "migrated automated reporting weekly dashboards mentored interns owned roadmap sprint reviews python "
+         "java sql spring docker kubernetes git agile testing").split()
+
+
+def _resume(rng, lines=45):
+    return [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(lines)]
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    for statement in skill_index.SCHEMA + fingerprint.SCHEMA:
+        conn.execute(statement)
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_one_edited_line_is_a_near_duplicate(conn, seed):
+    rng = random.Random(seed)
+    lines = _resume(rng)
+    key = fingerprint.dedupe_key("asha", "TCS", "Software Developer", "Fresher")
+    fingerprint.record(conn, 1, key, fingerprint.fingerprint("\n".join(lines)), "digest", {"score": 50})
+
+    lines[rng.randrange(len(lines))] = " ".join(rng.choice(WORDS) for _ in range(12))
+    match = fingerprint.lookup(conn, key, fingerprint.fingerprint("\n".join(lines)), "digest")
+    assert match is not None and match["kind"] == "near" and match["result_id"] == 1
+
+
+def test_different_resume_or_candidate_is_not_a_duplicate(conn):
+    rng = random.Random(0)
+    key = fingerprint.dedupe_key("asha", "TCS", "Software Developer", "Fresher")
+    text = "\n".join(_resume(rng))
+    fingerprint.record(conn, 1, key, fingerprint.fingerprint(text), "digest", {"score": 50})
+    assert fingerprint.lookup(conn, key, fingerprint.fingerprint("\n".join(_resume(rng))), "digest") is None
+    other = fingerprint.dedupe_key("ravi", "TCS", "Software Developer", "Fresher")
+    assert fingerprint.lookup(conn, other, fingerprint.fingerprint(text), "digest") is None
+
+
+def test_rebucket_moves_old_layout_rows_to_current_bands(conn, monkeypatch):
+    rng = random.Random(1)
+    key = fingerprint.dedupe_key("asha", "TCS", "Software Developer", "Fresher")
+    fp = fingerprint.fingerprint("\n".join(_resume(rng)))
+    with monkeypatch.context() as m:
+        m.setattr(fingerprint, "BANDS", 4)
+        m.setattr(fingerprint, "BAND_BITS", 16)
+        fingerprint.record(conn, 1, key, fp, "digest", {"score": 50})
+    conn.execute("INSERT INTO meta (key, value) VALUES (?, '4x16')", (fingerprint.LAYOUT_KEY,))
+
+    monkeypatch.setattr(fingerprint, "REBUCKET_CHUNK", 1)
+    fingerprint.record(conn, 2, key, fingerprint.fingerprint("\n".join(_resume(rng))), "digest", {"score": 10})
+    while fingerprint._rebucket_chunk(conn):
+        pass
+    buckets = {row[0] for row in conn.execute("SELECT bucket FROM fingerprint_buckets WHERE result_id = 1")}
+    assert buckets == set(fingerprint.buckets(key, fp.simhash))
+    assert conn.execute("SELECT value FROM meta WHERE key = ?", (fingerprint.LAYOUT_KEY,)).fetchone()[0] == "16x4"
+    assert fingerprint._rebucket_chunk(conn) == 0
@@ -0,0 +1,166 @@
+# tests/test_jobs.py
+
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import jobs
+import storage
+
+
+class Permanent(ValueError):
+    pass
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def make(handler=lambda payload, data: {"ok": True}):
+        db = storage.Storage(path=str(tmp_path / "jobs.db"), schema=jobs.SCHEMA)
+        queue = jobs.JobQueue(db, {"analyze": handler}, permanent_errors=(Permanent,),
+                              spool_dir=str(tmp_path / "spool"))
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.stop()
+        queue.storage.close()
+
+
+def claim(queue, max_priority=jobs.PRIORITY_BULK, worker="w"):
+    claimed = queue.storage.write(lambda conn: queue._claim(conn, worker, max_priority))
+    return claimed and claimed[2]["n"]
+
+
+def submit(queue, n, user="u", priority=jobs.PRIORITY_INTERACTIVE, data=None):
+    job_id = queue.submit("analyze", {"n": n}, data, user=user, priority=priority)
+    time.sleep(0.002)  # distinct created_at
+    return job_id
+
+
+def test_interactive_jobs_are_claimed_first_then_oldest(make_queue):
+    queue = make_queue()
+    submit(queue, 1, "a", jobs.PRIORITY_BULK)
+    submit(queue, 2, "b", jobs.PRIORITY_BULK)
+    submit(queue, 3, "c")
+    assert [claim(queue) for _ in range(4)] == [3, 1, 2, None]
+
+
+def test_per_user_limit(make_queue):
+    queue = make_queue()
+    for n in range(jobs.PER_USER_LIMIT + 1):
+        submit(queue, n, "bulk-user")
+    submit(queue, 99, "other")
+    claimed = [claim(queue) for _ in range(jobs.PER_USER_LIMIT + 2)]
+    assert claimed == list(range(jobs.PER_USER_LIMIT)) + [99, None]
+
+
+def test_reserved_worker_only_runs_interactive_jobs(make_queue, monkeypatch):
+    monkeypatch.setattr(jobs, "POLL_SECONDS", 0.05)
+    release = threading.Event()
+    started = []
+
+    def handler(payload, data):
+        started.append(payload["n"])
+        if payload["n"] != "interactive":
+            release.wait(10)
+        return {}
+
+    queue = make_queue(handler)
+    assert claim(queue, jobs.PRIORITY_INTERACTIVE) is None
+    for n in range(3):
+        submit(queue, n, f"bulk{n}", jobs.PRIORITY_BULK)
+    queue.start(2)
+    try:
+        interactive = submit(queue, "interactive", "asha")
+        deadline = time.time() + 5
+        while queue.get(interactive)["status"] != "done" and time.time() < deadline:
+            time.sleep(0.02)
+        assert queue.get(interactive)["status"] == "done"
+        # One bulk job runs on the unreserved worker, the rest wait
+        assert started.count("interactive") == 1 and len(started) == 2
+    finally:
+        release.set()
+
+
+def test_expired_lease_is_requeued_then_failed_after_max_attempts(make_queue):
+    queue = make_queue()
+    job_id = submit(queue, 1, data=b"%PDF")
+    for attempt in range(1, jobs.MAX_ATTEMPTS + 1):
+        assert claim(queue) == 1
+        queue.storage.write(lambda conn: conn.execute("UPDATE jobs SET lease_until = 0 WHERE id = ?", (job_id,)))
+        queue._recover_now()
+        job = queue.get(job_id)
+        assert job["attempts"] == attempt
+        assert job["status"] == ("failed" if attempt == jobs.MAX_ATTEMPTS else "queued")
+    assert job["error"] == "worker stopped responding"
+    assert not os.path.exists(queue._spool_path(job_id))
+
+
+def _run_claimed(queue, job_id):
+    claimed = queue.storage.write(lambda conn: queue._claim(conn, "w", jobs.PRIORITY_BULK))
+    assert claimed[0] == job_id
+    queue._run(*claimed, "w")
+    return queue.get(job_id)
+
+
+def test_permanent_errors_fail_at_once_and_remove_the_spool(make_queue):
+    def handler(payload, data):
+        raise Permanent("PDF has 99 pages")
+
+    queue = make_queue(handler)
+    job_id = submit(queue, 1, data=b"%PDF")
+    job = _run_claimed(queue, job_id)
+    assert (job["status"], job["attempts"], job["error"]) == ("failed", 1, "PDF has 99 pages")
+    assert not os.path.exists(queue._spool_path(job_id))
+
+
+def test_other_errors_are_retried_with_backoff_until_max_attempts(make_queue):
+    def handler(payload, data):
+        raise RuntimeError("flaky")
+
+    queue = make_queue(handler)
+    job_id = submit(queue, 1, data=b"%PDF")
+    for attempt in range(1, jobs.MAX_ATTEMPTS + 1):
+        job = _run_claimed(queue, job_id)
+        if attempt < jobs.MAX_ATTEMPTS:
+            assert job["status"] == "queued" and os.path.exists(queue._spool_path(job_id))
+            assert claim(queue) is None  # backing off
+            queue.storage.write(lambda conn: conn.execute("UPDATE jobs SET run_after = 0 WHERE id = ?", (job_id,)))
+    assert (job["status"], job["error"]) == ("failed", "RuntimeError: flaky")
+    assert not os.path.exists(queue._spool_path(job_id))
+
+
+def test_done_job_stores_result_and_removes_the_spool(make_queue):
+    queue = make_queue(lambda payload, data: {"bytes": len(data)})
+    job_id = submit(queue, 1, data=b"%PDF-1.4")
+    job = _run_claimed(queue, job_id)
+    assert (job["status"], job["result"]) == ("done", {"bytes": 8})
+    assert not os.path.exists(queue._spool_path(job_id))
+
+
+def test_worker_survives_a_failed_write(make_queue, monkeypatch):
+    monkeypatch.setattr(jobs, "POLL_SECONDS", 0.05)
+    monkeypatch.setattr(jobs, "ERROR_BACKOFF_SECONDS", 0.05)
+    queue = make_queue()
+    write, failures = queue.storage.write, []
+
+    def flaky_write(fn):
+        if len(failures) < 2:
+            failures.append(fn)
+            raise sqlite3.OperationalError("database is locked")
+        return write(fn)
+
+    job_id = submit(queue, 1)
+    monkeypatch.setattr(queue.storage, "write", flaky_write)
+    queue.start(1)
+    deadline = time.time() + 5
+    while queue.get(job_id)["status"] != "done" and time.time() < deadline:
+        time.sleep(0.02)
+    assert queue.get(job_id)["status"] == "done"
+    assert any(thread.name == "job-worker-0" and thread.is_alive() for thread in threading.enumerate())
@@ -0,0 +1,77 @@
+# tests/test_pdf_cache.py
+
+import sqlite3
+
+import pdf_cache
+from pdf_cache import TextCache
+
+
+def test_locked_disk_tier_degrades_to_misses(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_cache, "BUSY_TIMEOUT_MS", 50)
+    path = str(tmp_path / "cache.db")
+    cache = TextCache(path)
+    cache.put("a", "text a")
+
+    other = TextCache(path)
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN EXCLUSIVE")
+    try:
+        other.put("b", "text b")
+        assert other.get("b") == "text b"
+        assert other.get("missing") is None
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+    assert cache.get("a") == "text a"
+
+
+def test_unreadable_cache_file_means_memory_only(tmp_path):
+    path = tmp_path / "cache.db"
+    path.write_bytes(b"not a sqlite database" * 100)
+    cache = TextCache(str(path))
+    cache.put("a", "text a")
+    assert cache.get("a") == "text a"
+    assert cache.get("b") is None
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_disk_hits_are_flushed_before_trimming(tmp_path):
+    path = str(tmp_path / "cache.db")
+    writer = TextCache(path, disk_limit=30)
+    for key in "abc":
+        writer.put(key, key * 10)
+
+    # A fresh instance has an empty memory tier, so "a" is a disk hit whose
+    # last_used update is still buffered when the next put trims
+    reader = TextCache(path, disk_limit=30)
+    assert reader.get("a") == "a" * 10
+    reader.put("d", "d" * 10)
+
+    conn = sqlite3.connect(path)
+    keys = {key for (key,) in conn.execute("SELECT key FROM pdf_text")}
+    conn.close()
+    assert keys == {"a", "c", "d"}
+    assert reader.stats()["disk_bytes"] == 30
+
+
+def test_disk_hits_are_batched(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_cache, "TOUCH_BATCH", 2)
+    path = str(tmp_path / "cache.db")
+    writer = TextCache(path)
+    writer.put("a", "text a")
+    writer.put("b", "text b")
+
+    def last_used():
+        conn = sqlite3.connect(path)
+        try:
+            return dict(conn.execute("SELECT key, last_used FROM pdf_text"))
+        finally:
+            conn.close()
+
+    before = last_used()
+    reader = TextCache(path)
+    reader.get("a")
+    assert last_used() == before
+    reader.get("b")
+    after = last_used()
+    assert after["a"] > before["a"] and after["b"] > before["b"]
@@ -0,0 +1,65 @@
+# tests/test_pdf_extract.py
+
+import threading
+
+import pytest
+
+import pdf_extract
+from pdf_extract import PDFLimitError, PDFWorkerError, extract_text
+
+
+def test_pages_come_back_in_order(make_pdf):
+    data = make_pdf([[f"page {n} text"] for n in range(1, 11)])
+    text = extract_text(data, workers=3)
+    assert text.splitlines() == [f"page {n} text" for n in range(1, 11)]
+    assert extract_text(data, page_timeout=None) == text
+
+
+def test_escaped_characters_round_trip(make_pdf):
+    line = r"C:\resumes\cv (final).pdf"
+    assert extract_text(make_pdf([[line]]), page_timeout=None) == line
+
+
+def test_overrun_kills_only_that_requests_worker(make_pdf):
+    data = make_pdf([["skills: python, sql"]] * 3)
+    results = {}
+
+    def slow():
+        try:
+            extract_text(data, page_timeout=0, workers=1)
+        except PDFLimitError as e:
+            results["slow"] = e
+
+    def normal():
+        results["normal"] = extract_text(data, workers=1)
+
+    threads = [threading.Thread(target=slow), threading.Thread(target=normal)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert "took longer than" in str(results["slow"])
+    assert results["normal"].count("skills: python, sql") == 3
+    assert all(worker.process.is_alive() for worker in pdf_extract._idle)
+
+
+def test_page_limit_is_checked_before_extraction(make_pdf):
+    with pytest.raises(PDFLimitError, match="pages"):
+        extract_text(make_pdf([["x"]] * 5), max_pages=4)
+
+
+def test_live_workers_are_capped(make_pdf, monkeypatch):
+    monkeypatch.setattr(pdf_extract, "MAX_LIVE_WORKERS", 1)
+    monkeypatch.setattr(pdf_extract, "CHECKOUT_TIMEOUT_SECONDS", 0.2)
+    data = make_pdf([[f"page {n}"] for n in range(1, 11)])
+    while pdf_extract._idle:
+        pdf_extract._retire(pdf_extract._idle.pop())
+
+    held = pdf_extract._checkout(1)
+    try:
+        with pytest.raises(PDFWorkerError, match="busy"):
+            extract_text(data)
+    finally:
+        pdf_extract._checkin(held[0])
+    # The parallel split is clamped to the cap instead of waiting forever
+    assert extract_text(data, workers=3).splitlines() == [f"page {n}" for n in range(1, 11)]
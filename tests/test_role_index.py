@@ -0,0 +1,39 @@
+# tests/test_role_index.py
+
+import random
+
+import catalog
+from role_index import RoleIndex
+
+
+def reference_rank(requirements, found):
+    rows = []
+    for company, roles in requirements.items():
+        for designation, skills in roles.items():
+            matched = sum(skill in found for skill in skills)
+            rows.append((int(matched / len(skills) * 100), matched, company, designation))
+    order = sorted(range(len(rows)), key=lambda i: (-rows[i][0], -rows[i][1], i))
+    return [(rows[i][2], rows[i][3], rows[i][0]) for i in order]
+
+
+def test_rank_orders_by_score_then_matches_then_catalog_order():
+    index = RoleIndex({
+        "A": {"Dev": ("java", "sql", "git"), "Ops": ("linux", "git")},
+        "B": {"Dev": ("java", "git", "docker", "sql", "aws", "rest api"), "Data": ("sql",)},
+    })
+    ranking = index.rank({"java", "sql", "git", "not in catalog"})
+    assert [(row["company"], row["designation"], row["score"]) for row in ranking] == [
+        ("A", "Dev", 100), ("B", "Data", 100), ("B", "Dev", 50), ("A", "Ops", 50)]
+    assert ranking[2]["skills_found"] == ["java", "git", "sql"]
+    assert ranking[2]["missing"] == ["docker", "aws", "rest api"]
+    assert len(index.rank(set(), top_n=2)) == 2
+
+
+def test_rank_matches_a_per_role_scan_on_the_catalog():
+    compiled = catalog.load()
+    rng = random.Random(7)
+    for _ in range(50):
+        found = set(rng.sample(compiled.skills, rng.randint(0, 40)))
+        ranking = compiled.role_index.rank(found)
+        assert [(row["company"], row["designation"], row["score"]) for row in ranking] == \
+            reference_rank(compiled.requirements, found)
@@ -0,0 +1,59 @@
+# tests/test_rules.py
+
+import pytest
+
+import rules
+from sections import ResumeSections, heading_section
+from skill_matcher import SkillMatcher
+
+MATCHER = SkillMatcher(["java", "sql"])
+RULES = rules.compile_rules()
+FILLER = "Delivered reporting dashboards for stakeholders and reduced release latency. " * 8
+
+
+# The checks analyze_resume ran on the raw text before the rule engine
+def baseline_ats(text, experience):
+    text = text.lower()
+    feedback = []
+    if "objective" not in text and "summary" not in text:
+        feedback.append("📌 Missing an objective or summary section.")
+    if "experience" not in text and experience.lower() == "experienced":
+        feedback.append("📌 No experience section found.")
+    if "education" not in text:
+        feedback.append("📌 No education section detected.")
+    if len(text) < 500:
+        feedback.append("📌 Resume content too short, consider adding more details.")
+    return feedback
+
+
+def ats(text, experience):
+    outcome = RULES.evaluate(ResumeSections(text.lower(), MATCHER), "TCS", "Software Developer", experience, ["java"])
+    return outcome.ats
+
+
+@pytest.mark.parametrize("text", [
+    "Experience Summary\nJava developer.\n" + FILLER + "\nEducation\nB.Tech\n",
+    "Objective\nJoin a product team.\nExperience\n" + FILLER + "\nEducation\nB.Tech\n",
+    "Career objective: build backend systems in java.\nEducation B.Tech 2020\n" + FILLER,
+    "Summary\nExperienced Java developer.\n" + FILLER,
+    "Java developer.\nProjects\nInventory tracker in java and sql.\n",
+    "Java developer with sql.\n" + FILLER,
+    "",
+])
+@pytest.mark.parametrize("experience", ["Fresher", "Experienced"])
+def test_ats_checks_match_the_baseline(text, experience):
+    assert ats(text, experience) == baseline_ats(text, experience)
+
+
+def test_headings_without_a_keyword():
+    assert heading_section("Academic Background") == "education"
+    assert heading_section("Work History") == "experience"
+    assert heading_section("Skills & Tools") == "skills"
+    text = "Profile\nJava developer.\nWork History\n" + FILLER + "\nAcademic Background\nB.Tech\n"
+    assert ats(text, "Experienced") == []
+
+
+def test_section_keywords_must_be_single_words():
+    with pytest.raises(rules.RuleError, match="keywords"):
+        rules.compile_rules([{"id": "x", "type": "section", "section": "skills", "message": "m",
+                              "keywords": ["two words"]}])
@@ -0,0 +1,32 @@
+# tests/test_sections.py
+
+from sections import ResumeSections, heading_section
+from skill_matcher import SkillMatcher
+
+MATCHER = SkillMatcher(["java", "spring", "machine learning", "python", "sql"])
+
+
+def test_heading_shape():
+    assert heading_section("Technical Skills") == "skills"
+    assert heading_section("Machine Learning Projects") == "projects"
+    assert heading_section("Project Details") == "projects"
+    assert heading_section("Project Experience") == "projects"
+    assert heading_section("skills used") is None
+    assert heading_section("Experience with python") is None
+
+
+def test_skills_on_a_heading_line_belong_to_its_section():
+    resume = ResumeSections("Summary\nEager developer.\nMachine Learning Projects\nBuilt a recommender.\n", MATCHER)
+    assert resume.skills_in("projects") == {"machine learning"}
+    assert "machine learning" in resume.text_of("projects").lower()
+
+    resume = ResumeSections("Education\nB.Tech\nSkills: python, sql\n", MATCHER)
+    assert resume.skills_in("skills") == {"python", "sql"}
+
+
+def test_keyword_label_inside_a_section_is_not_a_heading():
+    text = "Projects\nInventory tracker\nSkills used: java, spring\nReduced stock errors.\nEducation\nB.Tech\n"
+    resume = ResumeSections(text, MATCHER)
+    assert [section.name for section in resume.sections] == ["projects", "education"]
+    assert resume.skills_in("projects") == {"java", "spring"}
+    assert not resume.has("skills")
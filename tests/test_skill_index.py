@@ -0,0 +1,25 @@
+# tests/test_skill_index.py
+
+import storage
+import skill_index
+
+
+def test_backfill_on_an_empty_database_lets_new_saves_skip_it(tmp_path):
+    db = storage.Storage(path=str(tmp_path / "results.db"), schema=storage.SCHEMA + skill_index.SCHEMA)
+    try:
+        assert skill_index.backfill(db) == 0
+        assert db.query("SELECT value FROM meta WHERE key = 'skill_backfill_id'") == [("0",)]
+
+        def insert(conn):
+            result_id = conn.execute(
+                "INSERT INTO resume_results (name, skills_found, suggestions) VALUES ('asha', 'java', 'sql')"
+            ).lastrowid
+            skill_index.index_result(conn, result_id, ["java"], ["sql"])
+            skill_index.advance_backfill(conn, result_id)
+            return result_id
+
+        result_id = db.write(insert)
+        assert db.query("SELECT value FROM meta WHERE key = 'skill_backfill_id'") == [(str(result_id),)]
+        assert skill_index.backfill(db) == 0
+    finally:
+        db.close()
@@ -0,0 +1,24 @@
+# tests/test_skill_matcher.py
+
+from skill_matcher import SkillMatcher
+
+
+def test_word_boundaries():
+    matcher = SkillMatcher(["java", "sql", ".net", "c++"])
+    assert matcher.find_all("javascript, mysql, asp.net and c++") == {".net", "c++"}
+    assert matcher.find_all("java/sql") == {"java", "sql"}
+
+
+def test_overlapping_and_nested_skills():
+    matcher = SkillMatcher(["spring", "spring boot", "excel", "ms excel", "data analysis", "analysis tools"])
+    assert matcher.find_all("spring boot, ms excel") == {"spring", "spring boot", "excel", "ms excel"}
+    assert matcher.find_all("data analysis tools") == {"data analysis", "analysis tools"}
+    assert matcher.find_all("spring boots") == {"spring"}
+
+
+def test_whitespace_runs_and_offsets():
+    matcher = SkillMatcher(["rest api", "c++", "java"])
+    text = "REST\n  API in c++java"
+    matches = list(matcher.finditer(text))
+    assert [skill for _, _, skill in matches] == ["rest api", "c++", "java"]
+    assert [text.lower()[start:end] for start, end, _ in matches] == ["rest\n  api", "c++", "java"]